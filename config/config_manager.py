@@ -37,6 +37,8 @@ class ConfigManager:
         self.memory_cleaner_interval = 300  # 内存清理间隔默认值(秒)
         self.memory_cleaner_threshold = 80.0  # 内存占用触发阈值默认值(百分比)
         self.memory_cleaner_cooldown = 60  # 内存清理冷却时间默认值(秒)
+        self.memory_cleaner_self_trim_only = False  # 清理工作集时只清理本程序默认值
+        self.memory_cleaner_min_working_set_mb = 8  # 逐个进程清理时只清理工作集大于该值的进程(MB)
 
         # I/O优先级设置
         self.io_priority_processes = []  # 需要自动设置I/O优先级的进程名列表，格式为[{"name": "进程名", "priority": 0}]
@@ -84,6 +86,8 @@ class ConfigManager:
                 "interval": 300,
                 "threshold": 80.0,
                 "cooldown": 60,
+                "self_trim_only": False,
+                "min_working_set_mb": 8,
             },
             "io_priority": {
                 "processes": [{"name": "SGuard64.exe", "priority": 0}, {"name": "ACE-Tray.exe", "priority": 0}]
@@ -191,6 +195,13 @@ class ConfigManager:
                         # 确保配置值合法
                         if self.memory_cleaner_cooldown < 30:
                             self.memory_cleaner_cooldown = 30
+                    if "self_trim_only" in config_data["memory_cleaner"]:
+                        self.memory_cleaner_self_trim_only = bool(config_data["memory_cleaner"]["self_trim_only"])
+                    if "min_working_set_mb" in config_data["memory_cleaner"]:
+                        self.memory_cleaner_min_working_set_mb = int(config_data["memory_cleaner"]["min_working_set_mb"])
+                        # 确保配置值合法
+                        if self.memory_cleaner_min_working_set_mb < 0:
+                            self.memory_cleaner_min_working_set_mb = 0
                     logger.debug("已从配置文件加载内存清理设置")
 
                 # 读取I/O优先级设置
@@ -246,6 +257,10 @@ class ConfigManager:
                     self.memory_cleaner_threshold = default_config["memory_cleaner"]["threshold"]
                 if "cooldown" in default_config["memory_cleaner"]:
                     self.memory_cleaner_cooldown = default_config["memory_cleaner"]["cooldown"]
+                if "self_trim_only" in default_config["memory_cleaner"]:
+                    self.memory_cleaner_self_trim_only = default_config["memory_cleaner"]["self_trim_only"]
+                if "min_working_set_mb" in default_config["memory_cleaner"]:
+                    self.memory_cleaner_min_working_set_mb = default_config["memory_cleaner"]["min_working_set_mb"]
 
             # 加载I/O优先级默认设置
             if "io_priority" in default_config and "processes" in default_config["io_priority"]:
@@ -284,6 +299,8 @@ class ConfigManager:
                     "interval": self.memory_cleaner_interval,
                     "threshold": self.memory_cleaner_threshold,
                     "cooldown": self.memory_cleaner_cooldown,
+                    "self_trim_only": self.memory_cleaner_self_trim_only,
+                    "min_working_set_mb": self.memory_cleaner_min_working_set_mb,
                 },
                 "io_priority": {"processes": self.io_priority_processes},
             }
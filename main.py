@@ -13,11 +13,14 @@ from config.config_manager import ConfigManager
 from core.process_monitor import GameProcessMonitor
 from core.system_utils import run_as_admin, check_single_instance
 from utils.logger import setup_logger, logger
-from utils.notification import find_icon_path, send_notification, create_notification_thread
+from utils.notification import find_icon_path, send_notification, create_notification_thread, stop_notification_thread
 from utils.process_io_priority import get_io_priority_service
 
 from ui.main_window import create_gui
 
+# 固定使用Fusion样式（界面外观由样式表决定），避免Qt每次启动时探测Windows原生样式
+os.environ.setdefault("QT_STYLE_OVERRIDE", "Fusion")
+
 
 def main():
     """主程序入口函数"""
@@ -94,10 +97,8 @@ def main():
         if io_priority_service and io_priority_service.running:
             io_priority_service.stop_service()
             
-        # 设置通知线程停止事件
-        stop_event.set()
-        # 等待通知线程结束
-        notification_thread_obj.join(timeout=0.5)
+        # 停止通知线程并等待其结束
+        stop_notification_thread(notification_thread_obj, stop_event, monitor.message_queue)
         
         logger.debug("🔴 ACE-KILLER 程序已终止！")
 
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+日志系统测试
+"""
+
+import os
+import time
+
+import pytest
+
+pytest.importorskip("windows_toasts")
+
+from utils import logger as logger_module
+from utils.logger import logger, setup_logger
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    yield str(tmp_path)
+    # 移除文件处理器，关闭日志文件
+    for name, handler_id in logger_module._handlers.items():
+        if handler_id is not None:
+            logger_module._remove_handler(handler_id)
+            logger_module._handlers[name] = None
+
+
+def test_setup_logger_replaces_own_handlers(log_dir):
+    setup_logger(log_dir)
+    first_ids = [i for i in logger_module._handlers.values() if i is not None]
+    
+    setup_logger(log_dir, debug_mode=True)
+    second_ids = [i for i in logger_module._handlers.values() if i is not None]
+    
+    assert len(first_ids) == len(second_ids)
+    assert not set(first_ids) & set(second_ids)
+    # 之前添加的处理器已被移除
+    for handler_id in first_ids:
+        with pytest.raises(ValueError):
+            logger.remove(handler_id)
+
+
+def test_setup_logger_keeps_other_handlers(log_dir):
+    messages = []
+    other_id = logger.add(messages.append, format="{message}", level="INFO")
+    try:
+        setup_logger(log_dir)
+        setup_logger(log_dir)
+        logger.info("hello")
+        assert messages == ["hello\n"]
+    finally:
+        logger.remove(other_id)
+
+
+def test_setup_logger_removes_expired_legacy_logs(log_dir):
+    old = time.time() - 30 * 86400
+    expired = os.path.join(log_dir, "2020-01-01.log")
+    recent = os.path.join(log_dir, "2020-01-02.log")
+    unrelated = os.path.join(log_dir, "other.log")
+    for path in (expired, recent, unrelated):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("log")
+    os.utime(expired, (old, old))
+    os.utime(unrelated, (old, old))
+    
+    setup_logger(log_dir, log_retention_days=7)
+    
+    assert not os.path.exists(expired)
+    assert os.path.exists(recent)
+    assert os.path.exists(unrelated)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+内存清理模块测试（清理步骤合并、清理开关位掩码）
+"""
+
+import sys
+
+import pytest
+
+if sys.platform != "win32":
+    pytest.skip("内存清理模块仅支持Windows", allow_module_level=True)
+
+from utils.memory_cleaner import (
+    ALL_CLEAN_STEPS, INTERVAL_SWITCH_MASK, THRESHOLD_SWITCH_MASK,
+    MemoryCleanerManager, MemoryEmptyWorkingSets, SystemMemoryListInformation,
+)
+
+
+@pytest.fixture
+def cleaner():
+    # 跳过单例初始化，不调用系统API
+    manager = object.__new__(MemoryCleanerManager)
+    manager.clean_switches = [False] * 6
+    manager._update_switch_mask()
+    return manager
+
+
+@pytest.mark.parametrize("switches, mask, has_interval, has_threshold", [
+    ([False] * 6, 0, False, False),
+    ([True, False, False, False, False, False], 0b000001, True, False),
+    ([False, False, True, False, False, False], 0b000100, True, False),
+    ([False, False, False, True, False, False], 0b001000, False, True),
+    ([False, True, False, False, False, True], 0b100010, True, True),
+    ([True] * 6, INTERVAL_SWITCH_MASK | THRESHOLD_SWITCH_MASK, True, True),
+])
+def test_update_switch_mask(cleaner, switches, mask, has_interval, has_threshold):
+    cleaner.clean_switches = switches
+    cleaner._update_switch_mask()
+    
+    assert cleaner._switch_mask == mask
+    assert cleaner._has_interval is has_interval
+    assert cleaner._has_threshold is has_threshold
+
+
+def _record_run_clean(cleaner):
+    calls = []
+    cleaner._run_clean = lambda steps, description: calls.append(set(steps))
+    return calls
+
+
+@pytest.mark.parametrize("switches, steps", [
+    ([True, False, False], {"workingsets"}),
+    ([False, True, False], {"cache"}),
+    ([True, True, False], {"workingsets", "cache"}),
+    ([True, True, True], set(ALL_CLEAN_STEPS)),
+    ([False, False, True], set(ALL_CLEAN_STEPS)),
+])
+def test_switched_cleaners_merge_steps(cleaner, switches, steps):
+    calls = _record_run_clean(cleaner)
+    
+    cleaner.clean_switches = switches + [False] * 3
+    cleaner._run_switched_cleaners(0, "定时清理")
+    cleaner.clean_switches = [False] * 3 + switches
+    cleaner._run_switched_cleaners(3, "阈值清理")
+    
+    # 合并后的步骤只执行一次
+    assert calls == [steps, steps]
+
+
+def test_switched_cleaners_skip_when_disabled(cleaner):
+    calls = _record_run_clean(cleaner)
+    cleaner.clean_switches = [False, False, False, True, True, True]
+    cleaner._run_switched_cleaners(0, "定时清理")
+    assert calls == []
+
+
+def _record_clean_steps(cleaner):
+    calls = []
+    cleaner._run_clean_step = lambda info_class, command: calls.append((info_class, command)) or 0
+    cleaner._trim_working_set = lambda: calls.append("trim")
+    return calls
+
+
+def test_full_clean_uses_system_working_set_purge(cleaner):
+    calls = _record_clean_steps(cleaner)
+    cleaner._perform_clean(ALL_CLEAN_STEPS)
+    
+    assert "trim" not in calls
+    assert (SystemMemoryListInformation, MemoryEmptyWorkingSets) in calls
+    assert len(calls) == len(ALL_CLEAN_STEPS)
+
+
+def test_working_set_clean_follows_trim_settings(cleaner):
+    calls = _record_clean_steps(cleaner)
+    cleaner._perform_clean({"workingsets", "cache"})
+    
+    assert calls.count("trim") == 1
+    assert (SystemMemoryListInformation, MemoryEmptyWorkingSets) not in calls
+    assert len(calls) == 2
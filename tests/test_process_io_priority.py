@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+进程I/O优先级模块测试（性能模式配置表）
+"""
+
+import sys
+
+import pytest
+
+if sys.platform != "win32":
+    pytest.skip("进程优先级模块仅支持Windows", allow_module_level=True)
+
+from utils.process_io_priority import (
+    IO_PRIORITY_HINT, NORMAL_PRIORITY_CLASS, PERFORMANCE_MODE,
+    PerformanceModeConfig, ProcessIoPriorityManager,
+)
+
+
+def test_mode_maps_derived_from_table():
+    table = PerformanceModeConfig.MODE_TABLE
+    modes = set(range(len(table)))
+    
+    for mode_map in (
+        PerformanceModeConfig.CPU_PRIORITY_MAP,
+        PerformanceModeConfig.IO_PRIORITY_MAP,
+        PerformanceModeConfig.CPU_AFFINITY_MAP,
+        PerformanceModeConfig.MODE_DESCRIPTIONS,
+    ):
+        assert set(mode_map) == modes
+    
+    for mode, (cpu_priority, io_priority, affinity, description, _) in enumerate(table):
+        assert PerformanceModeConfig.CPU_PRIORITY_MAP[mode] == cpu_priority
+        assert PerformanceModeConfig.IO_PRIORITY_MAP[mode] == io_priority
+        assert PerformanceModeConfig.CPU_AFFINITY_MAP[mode] == affinity
+        assert PerformanceModeConfig.MODE_DESCRIPTIONS[mode] == description
+        assert cpu_priority in PerformanceModeConfig.PRIORITY_NAMES
+
+
+def test_mode_constants_index_table():
+    descriptions = PerformanceModeConfig.MODE_DESCRIPTIONS
+    assert descriptions[PERFORMANCE_MODE.ECO_MODE] == "效能模式"
+    assert PerformanceModeConfig.CPU_AFFINITY_MAP[PERFORMANCE_MODE.ECO_MODE] == "last_core"
+
+
+@pytest.fixture
+def manager():
+    # 跳过初始化，只记录最终应用的设置
+    instance = object.__new__(ProcessIoPriorityManager)
+    instance._apply_by_mode = {}
+    instance.applied = []
+    instance._apply_settings = lambda *args: instance.applied.append(args) or True
+    return instance
+
+
+@pytest.mark.parametrize("mode", [-1, 4, 99, "bad", None, 1.5])
+def test_unknown_mode_falls_back(manager, mode):
+    assert manager.set_process_io_priority(1234, performance_mode=mode)
+    
+    (process_id, performance_mode, priority, cpu_priority,
+     affinity, throttle_mask, mode_text) = manager.applied[0]
+    assert process_id == 1234
+    assert performance_mode == mode
+    assert priority == IO_PRIORITY_HINT.IoPriorityLow
+    assert cpu_priority == NORMAL_PRIORITY_CLASS
+    assert affinity == "all_cores"
+    assert throttle_mask == 0
+    assert mode_text == f"未知模式({mode})"
+
+
+def test_explicit_io_priority_overrides_mode(manager):
+    manager.set_process_io_priority(1234, priority=IO_PRIORITY_HINT.IoPriorityVeryLow,
+                                    performance_mode=PERFORMANCE_MODE.ECO_MODE)
+    
+    row = PerformanceModeConfig.MODE_TABLE[PERFORMANCE_MODE.ECO_MODE]
+    assert manager.applied[0][2] == IO_PRIORITY_HINT.IoPriorityVeryLow
+    assert manager.applied[0][3] == row[0]
+    assert manager.applied[0][6] == row[3]
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+版本检查模块测试
+"""
+
+import pytest
+
+pytest.importorskip("windows_toasts")
+pytest.importorskip("PySide6")
+
+from utils.version_checker import UpdateInfo, VersionChecker, create_update_message
+
+
+@pytest.fixture
+def checker():
+    return VersionChecker()
+
+
+def _release(assets, body="更新说明"):
+    return {
+        "tag_name": "v1.2.0",
+        "name": "ACE-KILLER v1.2.0",
+        "body": body,
+        "html_url": "https://github.com/tools5/ACE-KILLER/releases/tag/v1.2.0",
+        "published_at": "2025-01-01T00:00:00Z",
+        "assets": assets,
+    }
+
+
+def test_parse_release_prefers_x64_zip(checker):
+    info = checker._parse_release(_release([
+        {"name": "notes.txt", "browser_download_url": "txt"},
+        {"name": "ACE-KILLER.ZIP", "browser_download_url": "plain"},
+        {"name": "ACE-KILLER-X64.zip", "browser_download_url": "x64"},
+    ]))
+    
+    assert info.version == "1.2.0"
+    assert info.name == "ACE-KILLER v1.2.0"
+    assert info.download_url == "x64"
+    assert info.published_at == "2025-01-01T00:00:00Z"
+
+
+def test_parse_release_falls_back_to_first_zip(checker):
+    info = checker._parse_release(_release([
+        {"name": "zip", "browser_download_url": "no-ext"},
+        {"name": "a.Zip", "browser_download_url": "a"},
+        {"name": "b.zip", "browser_download_url": "b"},
+    ]))
+    assert info.download_url == "a"
+    
+    info = checker._parse_release(_release([]))
+    assert info.download_url is None
+
+
+def test_parse_release_truncates_body(checker):
+    info = checker._parse_release(_release([], body="  " + "x" * 400 + "  "))
+    assert info.body == "x" * 300 + "..."
+
+
+def test_parse_release_requires_version(checker):
+    with pytest.raises(ValueError):
+        checker._parse_release({"tag_name": "", "assets": []})
+
+
+@pytest.mark.parametrize("current, latest, expected", [
+    ("1.1.3", "1.1.3", False),
+    ("1.1.3", "1.2.0", True),
+    ("1.2.0", "1.1.3", False),
+    ("v1.1", "1.1.0", False),
+    ("1.1.3-beta", "1.1.4+build.1", True),
+    ("1.1.9", "1.1.10", True),
+])
+def test_compare_versions(checker, current, latest, expected):
+    assert checker._compare_versions(current, latest) is expected
+
+
+def _update_info(download_url):
+    return UpdateInfo(
+        version="1.2.0",
+        name="",
+        body="更新说明",
+        url="https://github.com/tools5/ACE-KILLER/releases/tag/v1.2.0",
+        download_url=download_url,
+        published_at="",
+    )
+
+
+def test_create_update_message_error():
+    title, message, kind, data = create_update_message(False, "1.1.3", "", None, "网络错误")
+    assert kind == "error"
+    assert "网络错误" in message
+    assert "v1.1.3" in message
+    assert data["github_url"]
+
+
+def test_create_update_message_direct_download():
+    title, message, kind, data = create_update_message(True, "1.1.3", "1.2.0", _update_info("zip-url"), "")
+    assert kind == "update"
+    assert "版本名称: v1.2.0" in message
+    assert "更新内容:\n更新说明" in message
+    assert data == {"download_url": "zip-url", "is_direct_download": True}
+
+
+def test_create_update_message_release_page():
+    info = _update_info(None)
+    title, message, kind, data = create_update_message(True, "1.1.3", "1.2.0", info, "")
+    assert message.endswith("是否前往下载页面？")
+    assert data == {"download_url": info.url, "is_direct_download": False}
+
+
+def test_create_update_message_up_to_date():
+    title, message, kind, data = create_update_message(False, "1.2.0", "1.2.0", None, "")
+    assert kind == "info"
+    assert data == {}
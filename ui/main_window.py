@@ -336,6 +336,13 @@ class MainWindow(QWidget):
                                            "不开启则会逐个进程分别清理工作集，相对温和但效率较低。")
         options_layout.addWidget(self.brute_mode_checkbox)
         
+        # 只清理本程序
+        self.self_trim_only_checkbox = QCheckBox("只清理本程序工作集")
+        self.self_trim_only_checkbox.stateChanged.connect(self.toggle_self_trim_only)
+        self.self_trim_only_checkbox.setToolTip("开启后清理工作集时只清理ACE-KILLER自身，不影响游戏等其他进程；\n"
+                                                "系统缓存、待机列表等其他清理选项不受影响。")
+        options_layout.addWidget(self.self_trim_only_checkbox)
+        
         options_group.setLayout(options_layout)
         memory_layout.addWidget(options_group)
         
@@ -1097,6 +1104,9 @@ class MainWindow(QWidget):
         # 加载暴力模式设置
         self.brute_mode_checkbox.setChecked(self.memory_cleaner.brute_mode)
         
+        # 加载只清理本程序设置
+        self.self_trim_only_checkbox.setChecked(self.memory_cleaner.self_trim_only)
+        
         # 加载自定义配置设置
         self.interval_spinbox.setValue(self.memory_cleaner.clean_interval)
         self.threshold_spinbox.setValue(self.memory_cleaner.threshold)
@@ -1370,8 +1380,8 @@ class MainWindow(QWidget):
         # 异步检查更新
         self.version_checker.check_for_updates_async()
     
-    @Slot(bool, str, str, str, str)
-    def _on_version_check_finished(self, has_update, current_ver, latest_ver, update_info_str, error_msg):
+    @Slot(bool, str, str, object, str)
+    def _on_version_check_finished(self, has_update, current_ver, latest_ver, update_info, error_msg):
         """版本检查完成的处理函数"""
         # 恢复按钮状态
         self.check_update_btn.setText("检查更新")
@@ -1387,7 +1397,7 @@ class MainWindow(QWidget):
         
         # 创建并显示消息
         result = create_update_message(
-            has_update, current_ver, latest_ver, update_info_str, error_msg
+            has_update, current_ver, latest_ver, update_info, error_msg
         )
         
         # 解包结果
@@ -1475,10 +1485,8 @@ class MainWindow(QWidget):
                     webbrowser.open(final_download_url)
             elif should_download:
                 # 备用方案：打开发布页面
-                import json
                 try:
-                    update_info = json.loads(update_info_str)
-                    release_url = update_info.get('url', 'https://github.com/cassianvale/ACE-KILLER/releases/latest')
+                    release_url = update_info.url or 'https://github.com/cassianvale/ACE-KILLER/releases/latest'
                     webbrowser.open(release_url)
                 except:
                     webbrowser.open("https://github.com/cassianvale/ACE-KILLER/releases/latest")
@@ -1713,6 +1721,11 @@ class MainWindow(QWidget):
         
         logger.debug(f"内存清理暴力模式已{'启用' if enabled else '禁用'}")
     
+    @Slot()
+    def toggle_self_trim_only(self):
+        """切换只清理本程序工作集开关"""
+        self.memory_cleaner.set_self_trim_only(self.self_trim_only_checkbox.isChecked())
+    
     @Slot(int, int)
     def toggle_clean_option(self, option_index, state):
         """切换清理选项"""
@@ -1798,7 +1811,7 @@ class MainWindow(QWidget):
             return
         
         # 显示进度对话框
-        self.progress_dialog = QProgressDialog("正在清理内存...", "取消", 0, 3, self)
+        self.progress_dialog = QProgressDialog("正在清理内存...", "取消", 0, 1, self)
         self.progress_dialog.setWindowTitle("全面内存清理")
         self.progress_dialog.setModal(True)
         self.progress_dialog.setMinimumDuration(0)
@@ -1807,27 +1820,14 @@ class MainWindow(QWidget):
         # 创建一个线程来执行清理
         def clean_thread_func():
             try:
-                total_cleaned = 0
-                
-                # 清理工作集
-                cleaned_mb = self.memory_cleaner.trim_process_working_set()
-                total_cleaned += cleaned_mb
-                # 通过信号更新UI，而不是直接修改
-                self.progress_update_signal.emit(1)
-                
-                # 清理系统缓存
-                cleaned_mb = self.memory_cleaner.flush_system_buffer()
-                total_cleaned += cleaned_mb
-                self.progress_update_signal.emit(2)
-                
-                # 全面清理
-                cleaned_mb = self.memory_cleaner.clean_memory_all()
-                total_cleaned += cleaned_mb
-                self.progress_update_signal.emit(3)
-                
+                # 全部清理步骤（含工作集、系统缓存）各执行一次
+                total_cleaned = self.memory_cleaner.manual_clean()
                 logger.debug(f"全面内存清理已完成，总共释放了 {total_cleaned:.2f}MB 内存")
             except Exception as e:
                 logger.error(f"全面内存清理失败: {str(e)}")
+            finally:
+                # 通过信号更新UI，而不是直接修改
+                self.progress_update_signal.emit(1)
         
         # 创建并启动线程
         clean_thread = threading.Thread(target=clean_thread_func)
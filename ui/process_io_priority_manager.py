@@ -16,7 +16,7 @@ from PySide6.QtGui import QColor
 from utils.logger import logger
 from utils.process_io_priority import get_io_priority_manager, IO_PRIORITY_HINT, PERFORMANCE_MODE
 
-from ui.styles import ColorScheme, StyleHelper, theme_manager
+from ui.styles import current_scheme, StyleHelper, theme_manager
 
 
 class ProcessInfoWorker(QThread):
@@ -507,17 +507,18 @@ class ProcessIoPriorityManagerDialog(QDialog):
         # 进程名 - 为系统进程添加特殊标识
         name_item = self._get_or_create_item(row, 1)
         process_name = proc['name']
+        scheme = current_scheme()
         if proc.get('is_system', False):
             process_name = f"🔒 {process_name}"  # 系统进程添加锁定图标
-            name_item.setForeground(QColor(ColorScheme.PROCESS_SYSTEM()))  # 系统进程使用灰色
+            name_item.setForeground(QColor(scheme.PROCESS_SYSTEM))  # 系统进程使用灰色
         else:
-            name_item.setForeground(QColor(ColorScheme.PROCESS_USER()))  # 用户进程使用深色
+            name_item.setForeground(QColor(scheme.PROCESS_USER))  # 用户进程使用深色
         name_item.setText(process_name)
         
         # 用户 - 添加用户类型颜色区分
         user_item = self._get_or_create_item(row, 2)
         username = proc['username']
-        user_color = ColorScheme.PROCESS_SYSTEM_USER() if proc.get('is_system', False) else ColorScheme.PROCESS_USER()
+        user_color = scheme.PROCESS_SYSTEM_USER if proc.get('is_system', False) else scheme.PROCESS_USER
         user_item.setText(username)
         user_item.setForeground(QColor(user_color))
         
@@ -840,32 +841,34 @@ class ProcessIoPriorityManagerDialog(QDialog):
     
     def get_status_display(self, status):
         """获取进程状态的显示样式"""
+        scheme = current_scheme()
         status_map = {
-            'running': ('🟢', ColorScheme.PROCESS_RUNNING()),
-            'sleeping': ('💤', ColorScheme.PROCESS_SYSTEM()),
-            'disk-sleep': ('💾', ColorScheme.INFO()),
-            'stopped': ('⏸️', ColorScheme.WARNING_BTN()),
+            'running': ('🟢', scheme.PROCESS_RUNNING),
+            'sleeping': ('💤', scheme.PROCESS_SYSTEM),
+            'disk-sleep': ('💾', scheme.INFO),
+            'stopped': ('⏸️', scheme.WARNING_BTN),
             'tracing-stop': ('🔍', '#fd7e14'),
-            'zombie': ('💀', ColorScheme.DANGER()),
+            'zombie': ('💀', scheme.DANGER),
             'dead': ('☠️', '#6f42c1'),
             'wake-kill': ('⚡', '#e83e8c'),
             'waking': ('🌅', '#20c997'),
-            'idle': ('😴', ColorScheme.PROCESS_SYSTEM()),
+            'idle': ('😴', scheme.PROCESS_SYSTEM),
             'locked': ('🔒', '#fd7e14'),
-            'waiting': ('⏳', ColorScheme.INFO())
+            'waiting': ('⏳', scheme.INFO)
         }
-        return status_map.get(status.lower(), ('❓', ColorScheme.PROCESS_SYSTEM()))
+        return status_map.get(status.lower(), ('❓', scheme.PROCESS_SYSTEM))
     
     def get_memory_display(self, memory_mb):
         """获取内存使用量的显示样式"""
+        scheme = current_scheme()
         if memory_mb >= 1000:  # 大于1GB
-            return f"{memory_mb:.1f} MB", ColorScheme.MEMORY_HIGH()  # 红色 - 高内存使用
+            return f"{memory_mb:.1f} MB", scheme.MEMORY_HIGH  # 红色 - 高内存使用
         elif memory_mb >= 500:  # 500MB-1GB
             return f"{memory_mb:.1f} MB", '#fd7e14'  # 橙色 - 中等内存使用
         elif memory_mb >= 100:  # 100MB-500MB
-            return f"{memory_mb:.1f} MB", ColorScheme.WARNING_BTN()  # 黄色 - 一般内存使用
+            return f"{memory_mb:.1f} MB", scheme.WARNING_BTN  # 黄色 - 一般内存使用
         else:  # 小于100MB
-            return f"{memory_mb:.1f} MB", ColorScheme.MEMORY_LOW()  # 绿色 - 低内存使用
+            return f"{memory_mb:.1f} MB", scheme.MEMORY_LOW  # 绿色 - 低内存使用
     
     def delete_from_auto_optimize_list_by_button(self, button):
         """通过按钮从自动优化列表中删除进程"""
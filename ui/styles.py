@@ -5,7 +5,8 @@
 Ant Design风格UI样式定义
 """
 
-from PySide6.QtCore import QObject, Signal
+from dataclasses import dataclass
+from PySide6.QtCore import QObject, Signal, Slot, Qt
 from utils.logger import logger
 
 
@@ -143,30 +144,9 @@ class AntColorsDark:
     GRAY_13 = "#ffffff"         # 纯白
 
 
-class ThemeManager(QObject):
-    """主题管理器"""
-    
-    # 主题切换信号
-    theme_changed = Signal(str)  # 发送新主题名称
-    
-    def __init__(self):
-        super().__init__()
-        self._current_theme = "light"
-        self._light_stylesheet = None
-        self._dark_stylesheet = None
-        self._generate_stylesheets()
-    
-    def _generate_stylesheets(self):
-        """预生成浅色和深色两套完整样式表"""
-        # 生成浅色主题样式表
-        self._light_stylesheet = self._build_complete_stylesheet(AntColors)
-        
-        # 生成深色主题样式表
-        self._dark_stylesheet = self._build_complete_stylesheet(AntColorsDark)
-    
-    def _build_complete_stylesheet(self, colors):
-        """构建完整的样式表"""
-        return f"""
+def _build_qss(colors):
+    """构建完整的样式表"""
+    return f"""
         /* === 全局样式 === */
         * {{
             font-family: system-ui, -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Segoe UI Variable', 'Microsoft YaHei UI', 'Microsoft YaHei', '微软雅黑', 'PingFang SC', 'Hiragino Sans GB', 'Source Han Sans SC', 'Noto Sans CJK SC', 'WenQuanYi Micro Hei', Ubuntu, Roboto, 'Helvetica Neue', Helvetica, Arial, sans-serif;
@@ -918,7 +898,23 @@ class ThemeManager(QObject):
             padding: 8px;
             font-size: 12px;
         }}
-        """
+    """
+
+
+# 两套主题的完整样式表，导入时构建一次
+LIGHT_QSS = _build_qss(AntColors)
+DARK_QSS = _build_qss(AntColorsDark)
+
+
+class ThemeManager(QObject):
+    """主题管理器"""
+    
+    # 主题切换信号
+    theme_changed = Signal(str)  # 发送新主题名称
+    
+    def __init__(self):
+        super().__init__()
+        self._current_theme = "light"
     
     def set_theme(self, theme: str):
         """设置主题并发送信号"""
@@ -936,9 +932,9 @@ class ThemeManager(QObject):
             theme = self._current_theme
         
         if theme == "dark":
-            return self._dark_stylesheet
+            return DARK_QSS
         else:
-            return self._light_stylesheet
+            return LIGHT_QSS
     
     def is_dark_theme(self, theme: str = None) -> bool:
         """判断是否为深色主题"""
@@ -1052,51 +1048,41 @@ class StyleHelper:
         checkbox.style().polish(checkbox)
 
 
-class StatusHTMLGenerator:
-    """状态HTML生成器"""
-    
-    @staticmethod
-    def get_html_style(theme: str = None) -> str:
-        """获取状态HTML的CSS样式"""
-        if theme is None:
-            theme = theme_manager.get_current_theme()
-        
-        colors = AntColorsDark if theme == "dark" else AntColors
-        
-        return f"""
+# 状态HTML的CSS样式模板，占位符为颜色类中的颜色名
+_HTML_STYLE_TEMPLATE = """
         <style>
             .card {{
                 margin: 5px 0;
                 padding: 5px;
                 border-radius: 8px;
-                background-color: {colors.GRAY_1};
-                border: 1px solid {colors.GRAY_4};
+                background-color: {GRAY_1};
+                border: 1px solid {GRAY_4};
             }}
             .section-title {{
                 font-size: 14px;
                 font-weight: 600;
                 margin-bottom: 5px;
-                color: {colors.GRAY_10};
+                color: {GRAY_10};
                 line-height: 1.5;
             }}
             .status-success {{
-                color: {colors.SUCCESS_6};
+                color: {SUCCESS_6};
                 font-weight: 500;
             }}
             .status-warning {{
-                color: {colors.WARNING_6};
+                color: {WARNING_6};
                 font-weight: 500;
             }}
             .status-error {{
-                color: {colors.ERROR_6};
+                color: {ERROR_6};
                 font-weight: 500;
             }}
             .status-normal {{
-                color: {colors.GRAY_8};
+                color: {GRAY_8};
                 font-weight: 500;
             }}
             .status-disabled {{
-                color: {colors.GRAY_6};
+                color: {GRAY_6};
                 font-weight: 400;
             }}
             .status-item {{
@@ -1106,133 +1092,130 @@ class StatusHTMLGenerator:
             }}
             .update-time {{
                 font-size: 12px;
-                color: {colors.GRAY_7};
+                color: {GRAY_7};
                 text-align: right;
                 margin-top: 12px;
                 font-style: italic;
             }}
         </style>
-        """
+    """
 
 
-# === 颜色方案和辅助类 ===
+def _build_html_style(colors):
+    """构建状态HTML的CSS样式"""
+    return _HTML_STYLE_TEMPLATE.format_map(vars(colors))
 
 
-class ColorScheme:
-    """颜色方案 - 动态获取当前主题颜色"""
+# 两套主题的状态HTML样式，导入时构建一次
+LIGHT_HTML_STYLE = _build_html_style(AntColors)
+DARK_HTML_STYLE = _build_html_style(AntColorsDark)
+
+
+class StatusHTMLGenerator:
+    """状态HTML生成器"""
     
     @staticmethod
-    def _get_colors():
-        theme = theme_manager.get_current_theme()
-        return AntColorsDark if theme == "dark" else AntColors
-    
-    @classmethod
-    def SUCCESS(cls):
-        return cls._get_colors().SUCCESS_6
-    
-    @classmethod
-    def WARNING(cls):
-        return cls._get_colors().WARNING_6
-    
-    @classmethod
-    def ERROR(cls):
-        return cls._get_colors().ERROR_6
-    
-    @classmethod
-    def NORMAL(cls):
-        return cls._get_colors().GRAY_9
-    
-    @classmethod
-    def DISABLED(cls):
-        return cls._get_colors().GRAY_6
-    
-    @classmethod
-    def INFO(cls):
-        return cls._get_colors().PRIMARY_6
-    
-    @classmethod
-    def PRIMARY(cls):
-        return cls._get_colors().PRIMARY_6
-    
-    @classmethod
-    def SUCCESS_BTN(cls):
-        return cls._get_colors().SUCCESS_6
-    
-    @classmethod
-    def DANGER(cls):
-        return cls._get_colors().ERROR_6
-    
-    @classmethod
-    def WARNING_BTN(cls):
-        return cls._get_colors().WARNING_6
-    
-    @classmethod
-    def SECONDARY(cls):
-        return cls._get_colors().GRAY_6
-    
-    @classmethod
-    def MEMORY_LOW(cls):
-        return cls._get_colors().SUCCESS_6
-    
-    @classmethod
-    def MEMORY_MEDIUM(cls):
-        return cls._get_colors().WARNING_6
-    
-    @classmethod
-    def MEMORY_HIGH(cls):
-        return cls._get_colors().ERROR_6
-    
-    @classmethod
-    def PROCESS_RUNNING(cls):
-        return cls._get_colors().SUCCESS_6
-    
-    @classmethod
-    def PROCESS_SYSTEM(cls):
-        return cls._get_colors().GRAY_7
-    
-    @classmethod
-    def PROCESS_USER(cls):
-        return cls._get_colors().GRAY_9
-    
-    @classmethod
-    def PROCESS_SYSTEM_USER(cls):
-        return cls._get_colors().ERROR_6
-    
-    @classmethod
-    def TEXT_PRIMARY(cls):
-        return cls._get_colors().GRAY_9
-    
-    @classmethod
-    def TEXT_SECONDARY(cls):
-        return cls._get_colors().GRAY_7
-    
-    @classmethod
-    def TEXT_DISABLED(cls):
-        return cls._get_colors().GRAY_6
-    
-    @classmethod
-    def BG_PRIMARY(cls):
-        return cls._get_colors().GRAY_1
-    
-    @classmethod
-    def BG_SECONDARY(cls):
-        return cls._get_colors().GRAY_2
+    def get_html_style(theme: str = None) -> str:
+        """获取状态HTML的CSS样式"""
+        if theme is None:
+            theme = theme_manager.get_current_theme()
+        
+        return DARK_HTML_STYLE if theme == "dark" else LIGHT_HTML_STYLE
+
+
+# === 颜色方案和辅助类 ===
+
+
+@dataclass(frozen=True, slots=True)
+class ColorScheme:
+    """颜色方案 - 每个主题一份预先取好的颜色值，通过 current_scheme() 获取当前主题的实例"""
     
-    @classmethod
-    def BG_DISABLED(cls):
-        return cls._get_colors().GRAY_3
+    SUCCESS: str
+    WARNING: str
+    ERROR: str
+    NORMAL: str
+    DISABLED: str
+    INFO: str
+    PRIMARY: str
+    SUCCESS_BTN: str
+    DANGER: str
+    WARNING_BTN: str
+    SECONDARY: str
+    MEMORY_LOW: str
+    MEMORY_MEDIUM: str
+    MEMORY_HIGH: str
+    PROCESS_RUNNING: str
+    PROCESS_SYSTEM: str
+    PROCESS_USER: str
+    PROCESS_SYSTEM_USER: str
+    TEXT_PRIMARY: str
+    TEXT_SECONDARY: str
+    TEXT_DISABLED: str
+    BG_PRIMARY: str
+    BG_SECONDARY: str
+    BG_DISABLED: str
+    BORDER_PRIMARY: str
+    BORDER_SECONDARY: str
+    BORDER_LIGHT: str
     
     @classmethod
-    def BORDER_PRIMARY(cls):
-        return cls._get_colors().GRAY_5
+    def from_colors(cls, colors):
+        """从Ant Design颜色系统构建颜色方案"""
+        return cls(
+            SUCCESS=colors.SUCCESS_6,
+            WARNING=colors.WARNING_6,
+            ERROR=colors.ERROR_6,
+            NORMAL=colors.GRAY_9,
+            DISABLED=colors.GRAY_6,
+            INFO=colors.PRIMARY_6,
+            PRIMARY=colors.PRIMARY_6,
+            SUCCESS_BTN=colors.SUCCESS_6,
+            DANGER=colors.ERROR_6,
+            WARNING_BTN=colors.WARNING_6,
+            SECONDARY=colors.GRAY_6,
+            MEMORY_LOW=colors.SUCCESS_6,
+            MEMORY_MEDIUM=colors.WARNING_6,
+            MEMORY_HIGH=colors.ERROR_6,
+            PROCESS_RUNNING=colors.SUCCESS_6,
+            PROCESS_SYSTEM=colors.GRAY_7,
+            PROCESS_USER=colors.GRAY_9,
+            PROCESS_SYSTEM_USER=colors.ERROR_6,
+            TEXT_PRIMARY=colors.GRAY_9,
+            TEXT_SECONDARY=colors.GRAY_7,
+            TEXT_DISABLED=colors.GRAY_6,
+            BG_PRIMARY=colors.GRAY_1,
+            BG_SECONDARY=colors.GRAY_2,
+            BG_DISABLED=colors.GRAY_3,
+            BORDER_PRIMARY=colors.GRAY_5,
+            BORDER_SECONDARY=colors.GRAY_4,
+            BORDER_LIGHT=colors.GRAY_3,
+        )
+
+
+# 预先构建两套主题的颜色方案
+_SCHEME_LIGHT = ColorScheme.from_colors(AntColors)
+_SCHEME_DARK = ColorScheme.from_colors(AntColorsDark)
+
+
+def current_scheme() -> ColorScheme:
+    """获取当前主题的颜色方案"""
+    return _SCHEME_DARK if theme_manager.get_current_theme() == "dark" else _SCHEME_LIGHT
+
+
+class _ThemeApplier(QObject):
+    """将主题样式表应用到QApplication，每个应用只创建一个"""
     
-    @classmethod
-    def BORDER_SECONDARY(cls):
-        return cls._get_colors().GRAY_4
+    def __init__(self, app):
+        super().__init__(app)
+        self._app = app
     
-    @classmethod
-    def BORDER_LIGHT(cls):
-        return cls._get_colors().GRAY_3
+    @Slot(str)
+    def apply(self, theme):
+        """应用指定主题的样式表，样式表未变化时跳过以避免重复解析QSS"""
+        stylesheet = theme_manager.get_stylesheet(theme)
+        if self._app.styleSheet() != stylesheet:
+            self._app.setStyleSheet(stylesheet)
+
 
 class StyleApplier:
     """样式应用器"""
@@ -1240,10 +1223,11 @@ class StyleApplier:
     @staticmethod
     def apply_ant_design_theme(app):
         """应用Ant Design主题到整个应用"""
-        stylesheet = theme_manager.get_stylesheet()
-        app.setStyleSheet(stylesheet)
-        
-        # 连接主题变化信号
-        theme_manager.theme_changed.connect(
-            lambda theme: app.setStyleSheet(theme_manager.get_stylesheet(theme))
-        )
\ No newline at end of file
+        applier = getattr(app, "_ant_theme_applier", None)
+        if applier is None:
+            applier = _ThemeApplier(app)
+            app._ant_theme_applier = applier
+            # 连接主题变化信号，重复连接会被忽略
+            theme_manager.theme_changed.connect(applier.apply, Qt.UniqueConnection)
+        
+        applier.apply(theme_manager.get_current_theme())
@@ -1,20 +1,15 @@
 import os
 import sys
 import subprocess
-import shutil
 import argparse
 import re
+import struct
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from utils.logger import logger
 
-# 设置标准输出编码为UTF-8，解决Windows环境下中文输出问题
-if sys.stdout.encoding != 'utf-8':
-    try:
-        sys.stdout.reconfigure(encoding='utf-8')
-    except AttributeError:
-        # Python 3.6及更早版本兼容
-        import io
-        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-
 # 获取当前脚本所在目录
 current_dir = os.path.dirname(os.path.abspath(__file__))
 # 获取项目根目录
@@ -24,21 +19,32 @@ root_dir = os.path.dirname(current_dir)
 icon_path = os.path.join(root_dir, 'assets', 'icon', 'favicon.ico')
 assets_icon_dir = os.path.join(root_dir, 'assets', 'icon')
 
-# 检查资源文件是否存在
-if not os.path.exists(icon_path):
-    logger.error(f"图标文件不存在: {icon_path}")
-    sys.exit(1)
+def configure_stdout():
+    """设置标准输出编码为UTF-8，解决Windows环境下中文输出问题"""
+    if sys.stdout.encoding != 'utf-8':
+        try:
+            sys.stdout.reconfigure(encoding='utf-8')
+        except AttributeError:
+            # Python 3.6及更早版本兼容
+            import io
+            sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-if not os.path.exists(assets_icon_dir):
-    logger.error(f"图标资源目录不存在: {assets_icon_dir}")
-    sys.exit(1)
+def check_resources():
+    """检查资源文件是否存在，缺失时退出"""
+    if not os.path.exists(icon_path):
+        logger.error(f"图标文件不存在: {icon_path}")
+        sys.exit(1)
 
-logger.info(f"图标文件路径: {icon_path}")
-logger.info(f"图标资源目录: {assets_icon_dir}")
+    if not os.path.exists(assets_icon_dir):
+        logger.error(f"图标资源目录不存在: {assets_icon_dir}")
+        sys.exit(1)
 
-# 列出要包含的图标资源文件
-icon_files = [f for f in os.listdir(assets_icon_dir) if os.path.isfile(os.path.join(assets_icon_dir, f))]
-logger.info(f"将包含的图标资源文件: {', '.join(icon_files)}")
+    logger.info(f"图标文件路径: {icon_path}")
+    logger.info(f"图标资源目录: {assets_icon_dir}")
+
+    # 列出要包含的图标资源文件
+    icon_files = [f for f in os.listdir(assets_icon_dir) if os.path.isfile(os.path.join(assets_icon_dir, f))]
+    logger.info(f"将包含的图标资源文件: {', '.join(icon_files)}")
 
 def get_current_version():
     """获取当前版本号"""
@@ -122,6 +128,148 @@ def verify_version_sync():
         logger.error(f"验证版本号同步失败: {str(e)}")
         return False
 
+# ZIP文件结构（本地文件头、中央目录项、中央目录结束记录）
+_ZIP_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_ZIP_CENTRAL_HEADER = struct.Struct('<4s6H3L5H2L')
+_ZIP_END_RECORD = struct.Struct('<4s4H2LH')
+_ZIP_VERSION = 20          # 2.0：支持deflate
+_ZIP_UTF8_FLAG = 0x800     # 文件名使用UTF-8编码
+_ZIP32_LIMIT = 0xFFFFFFFF
+_ZIP32_MAX_ENTRIES = 0xFFFF
+
+def _deflate_file(file_path, level):
+    """读取文件并压缩为原始deflate数据（zlib压缩时会释放GIL），返回 (CRC, 原始大小, 压缩数据)"""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    compressed = compressor.compress(data) + compressor.flush()
+    return zlib.crc32(data), len(data), compressed
+
+def _dos_date_time(date_time):
+    """将 (年, 月, 日, 时, 分, 秒) 转换为ZIP使用的DOS日期和时间"""
+    year, month, day, hour, minute, second = date_time
+    dos_date = (max(year, 1980) - 1980) << 9 | month << 5 | day
+    dos_time = hour << 11 | minute << 5 | second // 2
+    return dos_date, dos_time
+
+def _write_deflated_zip(zip_path, files, level, max_workers):
+    """
+    由线程池并行压缩各文件，当前线程只按顺序写入已压缩好的数据和ZIP目录结构
+
+    只生成非ZIP64格式，调用方需保证总大小和文件数在限制内。
+    """
+    central_directory = []
+    with open(zip_path, 'wb') as fp, ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        def write_entry(file_path, arcname, future):
+            crc, file_size, compressed = future.result()
+            zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+            name = zinfo.filename.encode('utf-8')
+            dos_date, dos_time = _dos_date_time(zinfo.date_time)
+            offset = fp.tell()
+            fp.write(_ZIP_LOCAL_HEADER.pack(
+                b'PK\x03\x04', _ZIP_VERSION, _ZIP_UTF8_FLAG, zipfile.ZIP_DEFLATED, dos_time, dos_date,
+                crc, len(compressed), file_size, len(name), 0
+            ))
+            fp.write(name)
+            fp.write(compressed)
+            central_directory.append(_ZIP_CENTRAL_HEADER.pack(
+                b'PK\x01\x02', _ZIP_VERSION, _ZIP_VERSION, _ZIP_UTF8_FLAG, zipfile.ZIP_DEFLATED,
+                dos_time, dos_date, crc, len(compressed), file_size, len(name), 0, 0, 0, 0,
+                zinfo.external_attr, offset
+            ) + name)
+
+        # 限制同时驻留内存的压缩结果数量
+        max_pending = max_workers * 2
+        pending = deque()
+        for file_path, arcname in files:
+            pending.append((file_path, arcname, executor.submit(_deflate_file, file_path, level)))
+            if len(pending) >= max_pending:
+                write_entry(*pending.popleft())
+        while pending:
+            write_entry(*pending.popleft())
+
+        central_offset = fp.tell()
+        for record in central_directory:
+            fp.write(record)
+        central_size = fp.tell() - central_offset
+        fp.write(_ZIP_END_RECORD.pack(
+            b'PK\x05\x06', 0, 0, len(central_directory), len(central_directory),
+            central_size, central_offset, 0
+        ))
+
+def create_zip_archive(source_dir, zip_path):
+    """
+    将目录压缩为ZIP文件
+
+    Nuitka生成的exe和Qt DLL本身压缩率很低，默认使用最低压缩级别以缩短打包时间；
+    设置环境变量 ACE_FAST_ZIP=1 时直接存储不压缩。
+    压缩模式下各文件由线程池按CPU核心数并行压缩，再由当前线程顺序写入；
+    总大小或文件数超出普通ZIP格式限制时改用 zipfile 单线程写入ZIP64。
+    """
+    files = []
+    total_size = 0
+    for dirpath, _, filenames in os.walk(source_dir):
+        for filename in filenames:
+            file_path = os.path.join(dirpath, filename)
+            files.append((file_path, os.path.relpath(file_path, source_dir)))
+            total_size += os.path.getsize(file_path)
+
+    if os.environ.get('ACE_FAST_ZIP') == '1':
+        logger.info("ACE_FAST_ZIP=1，使用存储模式（不压缩）")
+        with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_STORED) as zf:
+            for file_path, arcname in files:
+                zf.write(file_path, arcname)
+        return
+
+    level = 1
+    # 预留压缩后数据膨胀和文件头的空间
+    if total_size + total_size // 100 + len(files) * 1024 >= _ZIP32_LIMIT or len(files) >= _ZIP32_MAX_ENTRIES:
+        logger.info("文件总大小或数量超出ZIP格式限制，使用ZIP64单线程压缩")
+        with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED,
+                             compresslevel=level, allowZip64=True) as zf:
+            for file_path, arcname in files:
+                zf.write(file_path, arcname)
+        return
+
+    max_workers = os.cpu_count() or 1
+    _write_deflated_zip(zip_path, files, level, max_workers)
+
+def get_build_env():
+    """构建子进程使用的精简环境变量，避免继承无关的大量环境变量"""
+    keep = (
+        "PATH", "PATHEXT", "TEMP", "TMP", "SystemRoot", "SystemDrive", "COMSPEC",
+        "USERPROFILE", "LOCALAPPDATA", "APPDATA", "NUMBER_OF_PROCESSORS", "PROCESSOR_ARCHITECTURE",
+        # Nuitka查找编译器和下载依赖时需要
+        "ProgramFiles", "ProgramFiles(x86)", "ProgramW6432", "ProgramData",
+        "HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "NO_PROXY",
+        "http_proxy", "https_proxy", "all_proxy", "no_proxy",
+    )
+    env = {k: os.environ[k] for k in keep if k in os.environ}
+    # 保留Nuitka和Python自身的配置变量
+    env.update({k: v for k, v in os.environ.items() if k.startswith(("NUITKA_", "PYTHON"))})
+    env["PYTHONIOENCODING"] = "utf-8"
+    return env
+
+def run_build_command(cmd):
+    """执行打包命令并实时输出日志，失败时抛出 CalledProcessError"""
+    proc = subprocess.Popen(
+        cmd,
+        env=get_build_env(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding='utf-8',
+        errors='replace',
+        bufsize=1
+    )
+    with proc.stdout:
+        for line in proc.stdout:
+            logger.info(line.rstrip())
+    returncode = proc.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
 def parse_arguments():
     """解析命令行参数"""
     parser = argparse.ArgumentParser(description='ACE-KILLER Nuitka 打包工具')
@@ -131,136 +279,63 @@ def parse_arguments():
     parser.add_argument('--no-version-update', 
                        action='store_true',
                        help='跳过版本号更新')
+    parser.add_argument('--no-uac-admin',
+                       action='store_true',
+                       help='不在可执行文件清单中请求管理员权限')
+    parser.add_argument('--release',
+                       action='store_true',
+                       help='发布构建：禁用并清除Nuitka缓存，启用链接时优化')
     return parser.parse_args()
 
-# 解析命令行参数
-args = parse_arguments()
-
-# 获取当前版本号
-current_version = get_current_version()
-logger.info(f"当前版本号: {current_version}")
+def build_nuitka_command(release=False, uac_admin=True):
+    """构建Nuitka打包命令"""
+    cmd = [
+        sys.executable,
+        "-m", "nuitka",
+        "--standalone",  # 生成独立可执行文件
+        "--windows-console-mode=disable",  # 禁用控制台
+        "--windows-icon-from-ico=" + icon_path,  # 设置图标
+        "--include-data-dir=%s=assets/icon" % assets_icon_dir,  # 包含整个图标资源目录
+        "--remove-output",  # 在重新构建前移除输出目录
+        
+        # PySide6 相关配置
+        "--enable-plugin=pyside6",  # 启用PySide6插件
+        "--nofollow-import-to=PySide6.QtWebEngineWidgets",
+        "--nofollow-import-to=PySide6.Qt3DCore",
+        "--nofollow-import-to=PySide6.Qt3DRender",
+        "--nofollow-import-to=PySide6.QtCharts",
+        "--nofollow-import-to=PySide6.QtDataVisualization",
+        "--nofollow-import-to=PySide6.QtMultimedia",
+        "--nofollow-import-to=PySide6.QtPositioning",
+        "--nofollow-import-to=PySide6.QtBluetooth",
+        "--nofollow-import-to=PySide6.QtSerialPort",
+        "--nofollow-import-to=PySide6.QtLocation",
+        # 优化选项
+        "--mingw64",  # 使用MinGW64
+        "--jobs=%d" % (os.cpu_count() or 4),  # 使用全部核心编译加速
+        "--output-filename=ACE-KILLER.exe",  # 指定输出文件名
+        "--nofollow-import-to=tkinter,PIL.ImageTk",  # 不跟随部分不必要模块
+        "--prefer-source-code",  # 优先使用源代码而不是字节码
+        "--python-flag=no_site",  # 不导入site
+        "--python-flag=no_warnings",  # 不显示警告
+    ]
 
-# 验证版本号同步状态
-verify_version_sync()
+    if uac_admin:
+        cmd.append("--windows-uac-admin")  # 请求管理员权限
 
-# 处理版本号更新
-if not args.no_version_update:
-    if args.version:
-        # 使用命令行指定的版本号
-        new_version = args.version
-        if update_version(new_version):
-            current_version = new_version
-        else:
-            sys.exit(1)
-    else:
-        # 交互式输入新版本号
-        print(f"\n当前版本号: {current_version}")
-        user_input = input("请输入新版本号 (格式: x.y.z，直接回车跳过): ").strip()
-        if user_input:
-            if update_version(user_input):
-                current_version = user_input
-            else:
-                sys.exit(1)
-        else:
-            logger.info("跳过版本号更新")
-
-logger.info(f"使用版本号进行打包: {current_version}")
-
-# 确保nuitka已安装
-try:
-    import nuitka
-except ImportError:
-    logger.info("正在安装 Nuitka...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "nuitka"])
-
-# PySide6相关设置
-try:
-    from PySide6.QtCore import QLibraryInfo
-    qt_plugins_path = QLibraryInfo.path(QLibraryInfo.PluginsPath)
-    qt_translations_path = QLibraryInfo.path(QLibraryInfo.TranslationsPath)
-    qt_binaries_path = QLibraryInfo.path(QLibraryInfo.BinariesPath)
-    logger.debug(f"Qt插件路径已找到: {qt_plugins_path}")
-except ImportError:
-    logger.error("无法导入 PySide6，请确保已正确安装")
-    sys.exit(1)
-
-# 构建Nuitka打包命令
-cmd = [
-    sys.executable,
-    "-m", "nuitka",
-    "--standalone",  # 生成独立可执行文件
-    "--windows-console-mode=disable",  # 禁用控制台
-    "--windows-icon-from-ico=" + icon_path,  # 设置图标
-    "--include-data-dir=%s=assets/icon" % assets_icon_dir,  # 包含整个图标资源目录
-    "--windows-uac-admin",  # 请求管理员权限
-    "--remove-output",  # 在重新构建前移除输出目录
-    
-    # PySide6 相关配置
-    "--enable-plugin=pyside6",  # 启用PySide6插件
-    "--nofollow-import-to=PySide6.QtWebEngineWidgets",
-    "--nofollow-import-to=PySide6.Qt3DCore",
-    "--nofollow-import-to=PySide6.Qt3DRender",
-    "--nofollow-import-to=PySide6.QtCharts",
-    "--nofollow-import-to=PySide6.QtDataVisualization",
-    "--nofollow-import-to=PySide6.QtMultimedia",
-    "--nofollow-import-to=PySide6.QtPositioning",
-    "--nofollow-import-to=PySide6.QtBluetooth",
-    "--nofollow-import-to=PySide6.QtSerialPort",
-    "--nofollow-import-to=PySide6.QtLocation",
-    # 优化选项
-    "--lto=yes",  # 链接时优化
-    "--mingw64",  # 使用MinGW64
-    "--jobs=4",  # 使用多核编译加速
-    "--disable-cache=all",  # 禁用缓存
-    "--clean-cache=all",  # 清除现有缓存
-    "--output-filename=ACE-KILLER.exe",  # 指定输出文件名
-    "--nofollow-import-to=tkinter,PIL.ImageTk",  # 不跟随部分不必要模块
-    "--prefer-source-code",  # 优先使用源代码而不是字节码
-    "--python-flag=no_site",  # 不导入site
-    "--python-flag=no_warnings",  # 不显示警告
-    "main.py"
-]
-
-logger.info("开始 Nuitka 打包...")
-logger.info("打包过程可能需要几分钟，请耐心等待...")
-
-# 执行打包命令
-try:
-    # 切换到项目根目录执行打包命令
-    os.chdir(root_dir)
-    subprocess.check_call(cmd)
-    
-    # 查找生成的可执行文件
-    main_exe = os.path.join(root_dir, "main.dist", "ACE-KILLER.exe")
-    
-    # 首先判断main_exe是否存在
-    if os.path.exists(main_exe):
-        logger.success(f"打包成功！生成的可执行文件: {main_exe}")
-        
-        # 输出文件大小信息
-        size_mb = os.path.getsize(main_exe) / (1024 * 1024)
-        logger.info(f"可执行文件大小: {size_mb:.2f} MB")
+    if release:
+        # 发布构建：禁用并清除缓存，保证从头完整编译
+        cmd += [
+            "--lto=yes",  # 链接时优化
+            "--disable-cache=all",  # 禁用缓存
+            "--clean-cache=all",  # 清除现有缓存
+        ]
     else:
-        logger.error("打包完成，但未找到可执行文件")
-        
-except subprocess.CalledProcessError as e:
-    logger.error(f"打包失败: {e}")
-    sys.exit(1)
-
-# 压缩可执行文件目录
-dist_dir = os.path.join(root_dir, "main.dist")
-zip_name = f"ACE-KILLER-v{current_version}-x64"
-zip_path = os.path.join(root_dir, zip_name + ".zip")
-if os.path.exists(dist_dir):
-    logger.info("正在压缩可执行文件目录...")
-    # 确保在正确的位置创建zip文件
-    shutil.make_archive(os.path.join(root_dir, zip_name), 'zip', dist_dir)
-    logger.success(f"压缩完成！生成的压缩包: {zip_path}")
-else:
-    logger.error("未找到可执行文件目录，无法压缩")
-    sys.exit(1)
-
-logger.success(f"ACE-KILLER v{current_version} Nuitka 打包和压缩完成！")
+        # 本地增量构建：保留编译缓存，关闭耗时的链接时优化
+        cmd.append("--lto=no")
+
+    cmd.append("main.py")
+    return cmd
 
 # 显示使用说明
 def show_usage():
@@ -277,12 +352,114 @@ def show_usage():
     print("3. 跳过版本号更新:")
     print("   python utils/build_exe.py --no-version-update")
     print()
-    print("4. 显示帮助:")
+    print("4. 发布构建 (禁用并清除编译缓存):")
+    print("   python utils/build_exe.py --release")
+    print()
+    print("5. 不在可执行文件清单中请求管理员权限:")
+    print("   python utils/build_exe.py --no-uac-admin")
+    print()
+    print("6. 显示帮助:")
     print("   python utils/build_exe.py -h")
     print("="*60)
 
-# 仅在直接运行脚本时显示使用说明
+def main(args):
+    """执行打包流程"""
+    configure_stdout()
+    check_resources()
+
+    # 获取当前版本号
+    current_version = get_current_version()
+    logger.info(f"当前版本号: {current_version}")
+
+    # 验证版本号同步状态
+    verify_version_sync()
+
+    # 处理版本号更新
+    if not args.no_version_update:
+        if args.version:
+            # 使用命令行指定的版本号
+            new_version = args.version
+            if update_version(new_version):
+                current_version = new_version
+            else:
+                sys.exit(1)
+        else:
+            # 交互式输入新版本号
+            print(f"\n当前版本号: {current_version}")
+            user_input = input("请输入新版本号 (格式: x.y.z，直接回车跳过): ").strip()
+            if user_input:
+                if update_version(user_input):
+                    current_version = user_input
+                else:
+                    sys.exit(1)
+            else:
+                logger.info("跳过版本号更新")
+
+    logger.info(f"使用版本号进行打包: {current_version}")
+
+    # 确保nuitka已安装
+    try:
+        import nuitka
+    except ImportError:
+        logger.info("正在安装 Nuitka...")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "nuitka"])
+
+    # PySide6相关设置
+    try:
+        from PySide6.QtCore import QLibraryInfo
+        qt_plugins_path = QLibraryInfo.path(QLibraryInfo.PluginsPath)
+        logger.debug(f"Qt插件路径已找到: {qt_plugins_path}")
+    except ImportError:
+        logger.error("无法导入 PySide6，请确保已正确安装")
+        sys.exit(1)
+
+    cmd = build_nuitka_command(args.release, uac_admin=not args.no_uac_admin)
+
+    logger.info("开始 Nuitka 打包...")
+    logger.info("打包过程可能需要几分钟，请耐心等待...")
+
+    # 执行打包命令
+    try:
+        # 切换到项目根目录执行打包命令
+        os.chdir(root_dir)
+        run_build_command(cmd)
+        
+        # 查找生成的可执行文件
+        main_exe = os.path.join(root_dir, "main.dist", "ACE-KILLER.exe")
+        
+        # 首先判断main_exe是否存在
+        if os.path.exists(main_exe):
+            logger.success(f"打包成功！生成的可执行文件: {main_exe}")
+            
+            # 输出文件大小信息
+            size_mb = os.path.getsize(main_exe) / (1024 * 1024)
+            logger.info(f"可执行文件大小: {size_mb:.2f} MB")
+        else:
+            logger.error("打包完成，但未找到可执行文件")
+            
+    except subprocess.CalledProcessError as e:
+        logger.error(f"打包失败: {e}")
+        sys.exit(1)
+
+    # 压缩可执行文件目录
+    dist_dir = os.path.join(root_dir, "main.dist")
+    zip_name = f"ACE-KILLER-v{current_version}-x64"
+    zip_path = os.path.join(root_dir, zip_name + ".zip")
+    if os.path.exists(dist_dir):
+        logger.info("正在压缩可执行文件目录...")
+        create_zip_archive(dist_dir, zip_path)
+        logger.success(f"压缩完成！生成的压缩包: {zip_path}")
+    else:
+        logger.error("未找到可执行文件目录，无法压缩")
+        sys.exit(1)
+
+    logger.success(f"ACE-KILLER v{current_version} Nuitka 打包和压缩完成！")
+
+
 if __name__ == "__main__":
+    # 先解析参数，-h 时无需执行任何检查和重量级导入
+    args = parse_arguments()
+    main(args)
     if len(sys.argv) == 1:
         print(f"\n当前项目版本: {get_current_version()}")
         show_usage()
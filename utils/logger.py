@@ -6,13 +6,46 @@
 """
 
 import os
+import re
 import sys
-import datetime
+import time
 from loguru import logger as _logger
 
 # 统一logger实例
 logger = _logger
 
+# setup_logger添加的日志处理器ID，重复调用时只替换这些处理器
+_handlers = {"file": None, "console": None}
+_default_handler_removed = False
+
+# 旧版本按日期命名的日志文件（YYYY-MM-DD.log），不受当前文件处理器的保留策略管理
+_LEGACY_LOG_NAME_RE = re.compile(r'^\d{4}-\d{2}-\d{2}\.log$')
+
+
+def _remove_handler(handler_id):
+    """移除指定的日志处理器，已被移除时忽略"""
+    try:
+        logger.remove(handler_id)
+    except ValueError:
+        pass
+
+
+def _remove_legacy_logs(log_dir, log_retention_days):
+    """删除超过保留天数的旧版按日期命名的日志文件"""
+    cutoff = time.time() - log_retention_days * 86400
+    try:
+        with os.scandir(log_dir) as entries:
+            for entry in entries:
+                if not _LEGACY_LOG_NAME_RE.match(entry.name) or not entry.is_file():
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+
 
 def setup_logger(log_dir, log_retention_days=7, log_rotation="1 day", debug_mode=False):
     """
@@ -27,24 +60,39 @@ def setup_logger(log_dir, log_retention_days=7, log_rotation="1 day", debug_mode
     Returns:
         logger: 配置好的logger实例
     """
-    # 移除默认的日志处理器
-    logger.remove()
+    global _default_handler_removed
+
+    # 移除loguru默认的日志处理器（ID为0），仅首次调用时需要
+    if not _default_handler_removed:
+        _remove_handler(0)
+        _default_handler_removed = True
+
+    # 移除本函数之前添加的处理器，保留其他模块添加的处理器
+    for name, handler_id in _handlers.items():
+        if handler_id is not None:
+            _remove_handler(handler_id)
+            _handlers[name] = None
     
     # 设置日志级别，调试模式为True时输出DEBUG级别日志，否则输出INFO级别
     log_level = "DEBUG" if debug_mode else "INFO"
     
-    # 获取当前日期作为日志文件名的一部分
-    today = datetime.datetime.now().strftime("%Y-%m-%d")
-    log_file = os.path.join(log_dir, f"{today}.log")
+    # 使用固定文件名，按日期轮转和保留由loguru负责（轮转后的文件会自动附加时间后缀）
+    log_file = os.path.join(log_dir, "ace-killer.log")
+
+    # 旧版本的日志文件名不同，按相同的保留天数清理
+    _remove_legacy_logs(log_dir, log_retention_days)
 
     # 添加文件日志处理器，配置轮转和保留策略，写入到文件中
-    logger.add(
+    _handlers["file"] = logger.add(
         log_file,
         rotation=log_rotation,  # 日志轮转周期
         retention=f"{log_retention_days} days",  # 日志保留天数
         format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {module}:{function}:{line} | {message}",
         level=log_level,
-        encoding="utf-8"
+        encoding="utf-8",
+        enqueue=True,  # 通过后台线程写入文件，避免调用线程等待磁盘I/O
+        backtrace=False,
+        diagnose=False  # 记录异常时不展开变量值，开销较大
     )
     
     # 判断是否为打包的可执行文件，以及是否有控制台
@@ -63,11 +111,12 @@ def setup_logger(log_dir, log_retention_days=7, log_rotation="1 day", debug_mode
     # 只有在有控制台的情况下才添加控制台日志处理器
     if has_console:
         # 添加控制台日志处理器，输出到控制台
-        logger.add(
+        _handlers["console"] = logger.add(
             sys.stderr,
             format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {module}:{function}:{line} | {message}",
             level=log_level,
-            colorize=True
+            colorize=True,
+            enqueue=is_frozen
         )
         logger.debug("已添加控制台日志处理器")
     else:
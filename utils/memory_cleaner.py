@@ -5,10 +5,13 @@
 内存清理工具类
 """
 
+import os
 import time
 import threading
 import ctypes
-from ctypes import windll, wintypes, byref, Structure, POINTER, sizeof, c_long
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from ctypes import wintypes, byref, Structure, POINTER, sizeof, c_long
 import psutil
 from utils.logger import logger
 
@@ -21,24 +24,73 @@ NTSTATUS = c_long
 wintypes.NTSTATUS = NTSTATUS
 
 # Windows API 常量
-PROCESS_ALL_ACCESS = 0x1F0FFF
+PROCESS_SET_QUOTA = 0x0100
+PROCESS_QUERY_INFORMATION = 0x0400
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
 MEM_COMMIT = 0x1000
 MEM_RESERVE = 0x2000
 MEM_RELEASE = 0x8000
 PAGE_READWRITE = 0x04
 IDLE_PRIORITY_CLASS = 0x40
+CURRENT_PROCESS_HANDLE = -1  # GetCurrentProcess() 返回的伪句柄
+
+# 清理进程工作集时依次尝试的打开进程访问权限
+TRIM_ACCESS_MASKS = (
+    PROCESS_QUERY_INFORMATION | PROCESS_SET_QUOTA,
+    PROCESS_QUERY_LIMITED_INFORMATION | PROCESS_SET_QUOTA,
+)
+
+# SIZE_T 的最大值 ((SIZE_T)-1)，用于清空工作集/缓存
+_SIZE_MAX = ctypes.c_size_t(-1).value
+
+# NTSTATUS 状态码
+STATUS_INFO_LENGTH_MISMATCH = 0xC0000004
 
 # 系统信息类别
+SystemProcessInformation = 0x05
 SystemFileCacheInformation = 0x15
 SystemMemoryListInformation = 0x50
 SystemCombinePhysicalMemoryInformation = 0x82
 
+# 无法打开的进程记录的有效期（秒），过期后重新尝试
+UNREACHABLE_PID_TTL = 600
+
+# 清理开关位掩码：开关0-2为定时清理，开关3-5为阈值清理
+INTERVAL_SWITCH_MASK = 0b000111
+THRESHOLD_SWITCH_MASK = 0b111000
+
 # 内存列表命令
 MemoryEmptyWorkingSets = 0x2
 MemoryFlushModifiedList = 0x3
 MemoryPurgeStandbyList = 0x4
 MemoryPurgeLowPriorityStandbyList = 0x5
 
+# 清理步骤：(步骤名, 系统信息类, 内存列表命令, 描述)，按顺序执行
+# 单独清理工作集时 "workingsets" 步骤按暴力模式/权限选择清理方式，见 _trim_working_set；
+# 全面清理时始终使用系统级 MemoryEmptyWorkingSets 命令
+_CLEAN_STEPS = (
+    ("combine", SystemCombinePhysicalMemoryInformation, None, "合并物理内存"),
+    ("cache", SystemFileCacheInformation, None, "清理系统缓存"),
+    ("workingsets", SystemMemoryListInformation, MemoryEmptyWorkingSets, "清理进程工作集"),
+    ("lowstandby", SystemMemoryListInformation, MemoryPurgeLowPriorityStandbyList, "清理低优先级待机列表"),
+    ("standby", SystemMemoryListInformation, MemoryPurgeStandbyList, "清理待机列表"),
+    ("modified", SystemMemoryListInformation, MemoryFlushModifiedList, "清理修改页面列表"),
+)
+
+# 全部清理步骤
+ALL_CLEAN_STEPS = frozenset(step[0] for step in _CLEAN_STEPS)
+
+# 清空待机列表的步骤：只有这些步骤会把页面放回空闲列表，
+# 清理工作集、系统缓存只会把页面移入待机/修改列表
+_STANDBY_PURGE_STEPS = frozenset({"lowstandby", "standby"})
+
+# 各清理开关对应的清理步骤（开关i与开关i+3相同：工作集、系统缓存、全面清理）
+_SWITCH_STEPS = (
+    frozenset({"workingsets"}),
+    frozenset({"cache"}),
+    ALL_CLEAN_STEPS,
+)
+
 # 系统文件缓存信息结构
 class SYSTEM_FILECACHE_INFORMATION(Structure):
     _fields_ = [
@@ -61,6 +113,69 @@ class MEMORY_COMBINE_INFORMATION_EX(Structure):
         ("Flags", wintypes.ULONG),
     ]
 
+# UNICODE_STRING 结构
+class UNICODE_STRING(Structure):
+    _fields_ = [
+        ("Length", wintypes.USHORT),
+        ("MaximumLength", wintypes.USHORT),
+        ("Buffer", wintypes.LPWSTR),
+    ]
+
+# 系统进程信息结构（只声明到 WorkingSetSize，后续字段未使用）
+class SYSTEM_PROCESS_INFORMATION(Structure):
+    _fields_ = [
+        ("NextEntryOffset", wintypes.ULONG),
+        ("NumberOfThreads", wintypes.ULONG),
+        ("WorkingSetPrivateSize", ctypes.c_longlong),
+        ("HardFaultCount", wintypes.ULONG),
+        ("NumberOfThreadsHighWatermark", wintypes.ULONG),
+        ("CycleTime", ctypes.c_ulonglong),
+        ("CreateTime", ctypes.c_longlong),
+        ("UserTime", ctypes.c_longlong),
+        ("KernelTime", ctypes.c_longlong),
+        ("ImageName", UNICODE_STRING),
+        ("BasePriority", wintypes.LONG),
+        ("UniqueProcessId", wintypes.HANDLE),
+        ("InheritedFromUniqueProcessId", wintypes.HANDLE),
+        ("HandleCount", wintypes.ULONG),
+        ("SessionId", wintypes.ULONG),
+        ("UniqueProcessKey", ctypes.c_size_t),
+        ("PeakVirtualSize", ctypes.c_size_t),
+        ("VirtualSize", ctypes.c_size_t),
+        ("PageFaultCount", wintypes.ULONG),
+        ("PeakWorkingSetSize", ctypes.c_size_t),
+        ("WorkingSetSize", ctypes.c_size_t),
+    ]
+
+# 内存列表信息结构（按页计数）
+class SYSTEM_MEMORY_LIST_INFORMATION(Structure):
+    _fields_ = [
+        ("ZeroPageCount", ctypes.c_size_t),
+        ("FreePageCount", ctypes.c_size_t),
+        ("ModifiedPageCount", ctypes.c_size_t),
+        ("ModifiedNoWritePageCount", ctypes.c_size_t),
+        ("BadPageCount", ctypes.c_size_t),
+        ("PageCountByPriority", ctypes.c_size_t * 8),
+        ("RepurposedPagesByPriority", ctypes.c_size_t * 8),
+        ("ModifiedPageCountPageFile", ctypes.c_size_t),
+    ]
+
+# 系统信息结构
+class SYSTEM_INFO(Structure):
+    _fields_ = [
+        ("wProcessorArchitecture", wintypes.WORD),
+        ("wReserved", wintypes.WORD),
+        ("dwPageSize", wintypes.DWORD),
+        ("lpMinimumApplicationAddress", wintypes.LPVOID),
+        ("lpMaximumApplicationAddress", wintypes.LPVOID),
+        ("dwActiveProcessorMask", ctypes.c_size_t),
+        ("dwNumberOfProcessors", wintypes.DWORD),
+        ("dwProcessorType", wintypes.DWORD),
+        ("dwAllocationGranularity", wintypes.DWORD),
+        ("wProcessorLevel", wintypes.WORD),
+        ("wProcessorRevision", wintypes.WORD),
+    ]
+
 class MemoryCleanerManager:
     """内存清理管理器类"""
     
@@ -78,7 +193,10 @@ class MemoryCleanerManager:
             
         # 配置
         self.clean_switches = [False] * 6
+        self._update_switch_mask()
         self.brute_mode = True
+        self.self_trim_only = False  # 清理工作集时只清理本程序
+        self.min_working_set_mb = 8  # 逐个进程清理时跳过工作集不超过该值(MB)的进程
         self.enabled = False  # 添加内存清理开关状态
         
         # 自定义配置项
@@ -89,8 +207,24 @@ class MemoryCleanerManager:
         # 状态
         self.running = False
         self._clean_thread = None
+        self._stop_event = threading.Event()  # 清理线程停止事件，每次启动线程时重新创建
+        self._config_changed = threading.Event()  # 配置变化事件，唤醒清理线程重新计算等待时间
         self._last_threshold_clean = 0  # 最后一次基于阈值的清理时间
         
+        # 进程信息查询缓冲区大小，按实际需要增长
+        self._process_info_buffer_size = 256 * 1024
+        
+        # 逐个进程清理时无法打开的进程 {(pid, 创建时间): 记录时间}，有效期内直接跳过
+        self._unreachable_pids = {}
+        # 各进程上次成功打开所用的访问权限 {(pid, 创建时间): 访问权限}，下次直接使用
+        self._pid_access_masks = {}
+        
+        # 逐个进程清理使用的线程池，ctypes调用期间释放GIL，各进程的系统调用可以并行
+        self._trim_executor = ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 1) * 2),
+            thread_name_prefix="memclean-"
+        )
+        
         # 清理统计
         self.total_cleaned_mb = 0
         self.last_cleaned_mb = 0
@@ -123,6 +257,58 @@ class MemoryCleanerManager:
             POINTER(wintypes.ULONG)
         ]
         
+        # 预分配的API参数缓冲区可能被清理线程、界面线程同时使用，修改和调用需持有此锁
+        self._buf_lock = threading.Lock()
+        
+        # 内存列表命令缓冲区，每次调用只修改其值
+        self._cmd_buf = wintypes.ULONG()
+        self._cmd_buf_size = sizeof(wintypes.ULONG)
+        
+        # 系统缓存清理参数，最小/最大工作集均为(SIZE_T)-1表示清空缓存，调用时不再修改
+        self._cache_info = SYSTEM_FILECACHE_INFORMATION()
+        self._cache_info.MinimumWorkingSet = _SIZE_MAX
+        self._cache_info.MaximumWorkingSet = _SIZE_MAX
+        self._cache_info_size = sizeof(SYSTEM_FILECACHE_INFORMATION)
+        
+        # 合并物理内存参数
+        self._combine_info = MEMORY_COMBINE_INFORMATION_EX()
+        self._combine_info_size = sizeof(MEMORY_COMBINE_INFORMATION_EX)
+        
+        # 逐个进程清理使用的kernel32函数，预先声明参数类型
+        self.kernel32 = ctypes.WinDLL('kernel32.dll')
+        
+        # 内存页大小，用于把页数换算为字节
+        system_info = SYSTEM_INFO()
+        self.kernel32.GetSystemInfo(byref(system_info))
+        self._page_size = system_info.dwPageSize or 4096
+        
+        # 内存列表信息查询缓冲区，查询失败后改用psutil统计清理量
+        self._memory_list_info = SYSTEM_MEMORY_LIST_INFORMATION()
+        self._memory_list_info_size = sizeof(SYSTEM_MEMORY_LIST_INFORMATION)
+        self._use_memory_list_info = True
+        
+        self._OpenProcess = self.kernel32.OpenProcess
+        self._OpenProcess.restype = wintypes.HANDLE
+        self._OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        
+        self._CloseHandle = self.kernel32.CloseHandle
+        self._CloseHandle.restype = wintypes.BOOL
+        self._CloseHandle.argtypes = [wintypes.HANDLE]
+        
+        # K32EmptyWorkingSet 即 psapi.EmptyWorkingSet 在kernel32中的实现
+        self._EmptyWorkingSet = self.kernel32.K32EmptyWorkingSet
+        self._EmptyWorkingSet.restype = wintypes.BOOL
+        self._EmptyWorkingSet.argtypes = [wintypes.HANDLE]
+        
+        self._SetProcessWorkingSetSizeEx = self.kernel32.SetProcessWorkingSetSizeEx
+        self._SetProcessWorkingSetSizeEx.restype = wintypes.BOOL
+        self._SetProcessWorkingSetSizeEx.argtypes = [
+            wintypes.HANDLE,
+            ctypes.c_size_t,
+            ctypes.c_size_t,
+            wintypes.DWORD
+        ]
+        
         # 从权限管理器获取可用功能
         self.available_functions = self.privilege_manager.available_functions
         
@@ -155,7 +341,7 @@ class MemoryCleanerManager:
         if summary["recommendations"]:
             logger.info("内存清理建议:")
             for rec in summary["recommendations"]:
-                logger.info(f"  • {rec}")
+                logger.info("  • {}", rec)
     
     def update_from_config_manager(self):
         """从配置管理器更新设置"""
@@ -164,7 +350,10 @@ class MemoryCleanerManager:
         
         self.enabled = self.config_manager.memory_cleaner_enabled
         self.brute_mode = self.config_manager.memory_cleaner_brute_mode
+        self.self_trim_only = self.config_manager.memory_cleaner_self_trim_only
+        self.min_working_set_mb = self.config_manager.memory_cleaner_min_working_set_mb
         self.clean_switches = self.config_manager.memory_cleaner_switches.copy()
+        self._update_switch_mask()
         
         # 加载自定义配置
         self.clean_interval = self.config_manager.memory_cleaner_interval
@@ -173,19 +362,32 @@ class MemoryCleanerManager:
         
         # 确保清理间隔不低于60秒
         if self.clean_interval < 60:
-            logger.warning(f"配置的清理间隔({self.clean_interval}秒)小于最小值60秒，将重置为60秒")
+            logger.warning("配置的清理间隔({}秒)小于最小值60秒，将重置为60秒", self.clean_interval)
             self.clean_interval = 60
             self.config_manager.memory_cleaner_interval = 60
             self.config_manager.save_config()
         
+        # 通知清理线程配置已变化
+        self._config_changed.set()
+        
         # 检查是否应该启动或停止清理线程
         self._check_should_run_thread()
         
         logger.debug("已从配置管理器更新内存清理设置")
     
+    def _update_switch_mask(self):
+        """根据清理开关重新计算位掩码（第i位对应开关i），只在开关变化时调用"""
+        mask = 0
+        for i, enabled in enumerate(self.clean_switches):
+            if enabled:
+                mask |= 1 << i
+        self._switch_mask = mask
+        self._has_interval = bool(mask & INTERVAL_SWITCH_MASK)
+        self._has_threshold = bool(mask & THRESHOLD_SWITCH_MASK)
+    
     def _check_should_run_thread(self):
         """检查是否应该运行清理线程"""
-        should_run = self.enabled and any(self.clean_switches)
+        should_run = self.enabled and bool(self._switch_mask)
         
         if should_run and not self.running:
             # 如果应该运行但未运行，则启动线程
@@ -203,6 +405,8 @@ class MemoryCleanerManager:
         
         self.config_manager.memory_cleaner_enabled = self.enabled
         self.config_manager.memory_cleaner_brute_mode = self.brute_mode
+        self.config_manager.memory_cleaner_self_trim_only = self.self_trim_only
+        self.config_manager.memory_cleaner_min_working_set_mb = self.min_working_set_mb
         self.config_manager.memory_cleaner_switches = self.clean_switches.copy()
         
         # 同步自定义配置
@@ -221,20 +425,171 @@ class MemoryCleanerManager:
         self.clean_count += 1
         self.last_clean_time = time.time()
     
-    def _get_memory_before_clean(self):
-        """获取清理前的内存信息，用于计算清理量"""
+    def _query_memory_list(self, count_standby):
+        """
+        通过 NtQuerySystemInformation(SystemMemoryListInformation) 读取可用页面数量
+        
+        Args:
+            count_standby (bool): 是否计入待机列表页面
+            
+        Returns:
+            int: 可用内存字节数，查询失败时返回None
+        """
         try:
-            mem = psutil.virtual_memory()
-            return mem.available
+            with self._buf_lock:
+                status = self.NtQuerySystemInformation(
+                    SystemMemoryListInformation,
+                    byref(self._memory_list_info),
+                    self._memory_list_info_size,
+                    None
+                )
+                if status == 0:
+                    info = self._memory_list_info
+                    pages = info.FreePageCount + info.ZeroPageCount
+                    if count_standby:
+                        pages += sum(info.PageCountByPriority)
+                    return pages * self._page_size
+            logger.debug("查询内存列表信息失败，错误码: {}", status)
+        except Exception as e:
+            logger.debug("查询内存列表信息失败: {}", e)
+        return None
+    
+    def _get_available_memory(self):
+        """
+        获取 psutil 统计的可用内存
+        
+        Returns:
+            int: 可用内存字节数
+        """
+        try:
+            return psutil.virtual_memory().available
         except Exception:
             return 0
+    
+    def _run_clean(self, steps, description):
+        """
+        执行一组清理步骤，并只在前后各采样一次可用内存
+        
+        前后两次采样使用同一数据源：优先使用内存列表信息，首次查询失败后改用 psutil。
+        清理工作集、系统缓存只会把页面移入待机列表，因此不清空待机列表时统计量计入待机页面。
+        
+        Args:
+            steps: 清理步骤名集合，见 _CLEAN_STEPS
+            description (str): 清理操作描述，用于日志
+            
+        Returns:
+            float: 释放的内存量(MB)
+        """
+        count_standby = not (steps & _STANDBY_PURGE_STEPS)
+        
+        use_memory_list_info = self._use_memory_list_info
+        before_available = None
+        if use_memory_list_info:
+            before_available = self._query_memory_list(count_standby)
+            if before_available is None:
+                logger.debug("改用psutil统计清理量")
+                self._use_memory_list_info = use_memory_list_info = False
+        if not use_memory_list_info:
+            before_available = self._get_available_memory()
+        
+        self._perform_clean(steps)
+        
+        # 计算清理的内存量，清理后查询失败时记为0
+        if use_memory_list_info:
+            after_available = self._query_memory_list(count_standby)
+            if after_available is None:
+                after_available = before_available
+        else:
+            after_available = self._get_available_memory()
+        cleaned_mb = max(0, (after_available - before_available) / (1024 * 1024))
+        self._record_cleaned_memory(cleaned_mb)
+        logger.debug("{}完成，释放了 {:.2f}MB 内存", description, cleaned_mb)
+        
+        return cleaned_mb
+    
+    def _set_memory_list_command(self, command):
+        """
+        发送内存列表命令 (SystemMemoryListInformation)
+        
+        Args:
+            command (int): 内存列表命令
             
+        Returns:
+            int: NTSTATUS状态码
+        """
+        with self._buf_lock:
+            self._cmd_buf.value = command
+            return self.NtSetSystemInformation(
+                SystemMemoryListInformation,
+                byref(self._cmd_buf),
+                self._cmd_buf_size
+            )
+    
+    def _set_file_cache_limits(self):
+        """
+        清空系统文件缓存工作集 (SystemFileCacheInformation)
+        
+        Returns:
+            int: NTSTATUS状态码
+        """
+        return self.NtSetSystemInformation(
+            SystemFileCacheInformation,
+            byref(self._cache_info),
+            self._cache_info_size
+        )
+    
+    def _combine_physical_memory(self):
+        """
+        合并物理内存 (SystemCombinePhysicalMemoryInformation)
+        
+        Returns:
+            int: NTSTATUS状态码，合并页数写入 self._combine_info.PagesCombined
+        """
+        with self._buf_lock:
+            self._combine_info.PagesCombined = 0
+            return self.NtSetSystemInformation(
+                SystemCombinePhysicalMemoryInformation,
+                byref(self._combine_info),
+                self._combine_info_size
+            )
+    
     def trim_process_working_set(self):
         """清理所有进程的工作集"""
+        return self._run_clean({"workingsets"}, "清理进程工作集")
+    
+    def trim_self_working_set(self):
+        """
+        只清理本程序的工作集
+        
+        对当前进程调用 SetProcessWorkingSetSizeEx(-1, -1)，一次系统调用完成，无需遍历进程
+        
+        Returns:
+            bool: 是否清理成功
+        """
+        try:
+            result = self._SetProcessWorkingSetSizeEx(
+                CURRENT_PROCESS_HANDLE,
+                _SIZE_MAX,
+                _SIZE_MAX,
+                0
+            )
+            if result:
+                logger.debug("清理本程序工作集成功")
+            else:
+                logger.warning("清理本程序工作集失败，错误码: {}", ctypes.GetLastError())
+            return bool(result)
+        except Exception as e:
+            logger.error("清理本程序工作集失败: {}", e)
+            return False
+    
+    def _trim_working_set(self):
+        """执行进程工作集清理（不统计清理量）"""
+        if self.self_trim_only:
+            # 只清理本程序，不遍历其他进程
+            self.trim_self_working_set()
+            return
+        
         try:
-            # 获取清理前的可用内存
-            before_available = self._get_memory_before_clean()
-            
             # 根据可用权限选择最佳方法
             if not self.available_functions.get("trim_all_processes", False):
                 logger.warning("缺少清理工作集所需权限，操作可能受限")
@@ -243,205 +598,189 @@ class MemoryCleanerManager:
             if self.brute_mode and self.available_functions.get("trim_all_processes", False):
                 logger.debug("使用暴力模式清理所有进程工作集")
                 command = MemoryEmptyWorkingSets
-                status = self.NtSetSystemInformation(
-                    SystemMemoryListInformation,
-                    byref(wintypes.ULONG(command)),
-                    sizeof(wintypes.ULONG)
-                )
+                status = self._set_memory_list_command(command)
                 
                 # 记录状态码并判断是否成功
                 if status == 0:  # STATUS_SUCCESS
                     logger.debug("暴力模式工作集清理成功，状态码: 0 (STATUS_SUCCESS)")
                 else:
-                    logger.error(f"暴力模式工作集清理失败，错误码: {status}")
+                    logger.error("暴力模式工作集清理失败，错误码: {}", status)
                     # 失败时回退到逐个进程模式
                     self._trim_processes_individually()
             else:
                 # 常规模式：逐个进程清理
                 self._trim_processes_individually()
+        
+        except Exception as e:
+            logger.error("清理进程工作集失败: {}", e)
+    
+    def _enumerate_processes(self):
+        """
+        通过一次 NtQuerySystemInformation(SystemProcessInformation) 调用获取所有进程
+        
+        Returns:
+            list: [(进程ID, 创建时间, 工作集字节数)] 列表，查询失败时回退到 psutil.pids()
+                （创建时间为0，工作集为None）
+        """
+        try:
+            while True:
+                size = self._process_info_buffer_size
+                buffer = ctypes.create_string_buffer(size)
+                return_length = wintypes.ULONG(0)
+                status = self.NtQuerySystemInformation(
+                    SystemProcessInformation,
+                    buffer,
+                    size,
+                    byref(return_length)
+                )
+                
+                if (status & 0xFFFFFFFF) == STATUS_INFO_LENGTH_MISMATCH:
+                    # 缓冲区不足，按返回的所需大小（预留增长空间）扩大后重试
+                    self._process_info_buffer_size = max(size * 2, return_length.value + 64 * 1024)
+                    continue
+                
+                if status != 0:
+                    raise OSError(f"NtQuerySystemInformation 错误码: {status}")
+                break
             
-            # 计算清理的内存量
-            after_available = self._get_memory_before_clean()
-            cleaned_mb = max(0, (after_available - before_available) / (1024 * 1024))
-            self._record_cleaned_memory(cleaned_mb)
-            logger.debug(f"清理进程工作集完成，释放了 {cleaned_mb:.2f}MB 内存")
+            processes = []
+            offset = 0
+            while True:
+                entry = SYSTEM_PROCESS_INFORMATION.from_buffer(buffer, offset)
+                if entry.UniqueProcessId:  # 跳过System Idle Process (PID 0)
+                    processes.append((entry.UniqueProcessId, entry.CreateTime, entry.WorkingSetSize))
+                if not entry.NextEntryOffset:
+                    break
+                offset += entry.NextEntryOffset
             
-            return cleaned_mb
+            return processes
         
         except Exception as e:
-            logger.error(f"清理进程工作集失败: {str(e)}")
-            return 0
+            logger.debug("枚举进程失败，回退到psutil: {}", e)
+            return [(pid, 0, None) for pid in psutil.pids()]
     
     def _trim_processes_individually(self):
         """逐个进程清理工作集（权限要求较低的方法）"""
         logger.debug("使用逐个进程清理模式")
-        use_debug_privilege = self.available_functions.get("debug_other_processes", False)
         
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                # 根据权限选择打开进程的方式
-                if use_debug_privilege:
-                    handle = windll.kernel32.OpenProcess(
-                        PROCESS_ALL_ACCESS,
-                        False,
-                        proc.info['pid']
-                    )
-                else:
-                    # 使用较低权限尝试
-                    handle = windll.kernel32.OpenProcess(
-                        0x0200 | 0x0400, # PROCESS_QUERY_INFORMATION | PROCESS_SET_QUOTA
-                        False,
-                        proc.info['pid']
-                    )
-                    
-                    if not handle:
-                        # 再次尝试最低权限
-                        handle = windll.kernel32.OpenProcess(
-                            0x1000 | 0x0400, # PROCESS_QUERY_LIMITED_INFORMATION | PROCESS_SET_QUOTA
-                            False,
-                            proc.info['pid']
-                        )
-                
-                if handle:
-                    windll.psapi.EmptyWorkingSet(handle)
-                    windll.kernel32.CloseHandle(handle)
-            except Exception:
-                # 忽略无法清理的进程
-                pass
+        # 清除过期的无法打开进程记录
+        now = time.time()
+        self._unreachable_pids = {
+            key: recorded for key, recorded in self._unreachable_pids.items()
+            if now - recorded < UNREACHABLE_PID_TTL
+        }
+        
+        # 只清理工作集超过阈值的进程，工作集未知时照常清理
+        min_working_set = self.min_working_set_mb * 1024 * 1024
+        processes = [
+            (pid, create_time) for pid, create_time, working_set in self._enumerate_processes()
+            if (working_set is None or working_set > min_working_set)
+            and (pid, create_time) not in self._unreachable_pids
+        ]
+        
+        # 只保留仍在运行的进程的访问权限记录
+        running = set(processes)
+        self._pid_access_masks = {
+            key: mask for key, mask in self._pid_access_masks.items() if key in running
+        }
+        
+        # 在线程池中并行清理，等待全部完成
+        trim_one = partial(self._trim_one, now=now)
+        for _ in self._trim_executor.map(trim_one, processes):
+            pass
     
-    def flush_system_buffer(self):
-        """清理系统缓存"""
+    def _trim_one(self, process, now):
+        """
+        清理单个进程的工作集
+        
+        EmptyWorkingSet 只需要查询信息和设置配额权限，先尝试 PROCESS_QUERY_INFORMATION，
+        失败后尝试 PROCESS_QUERY_LIMITED_INFORMATION；成功的访问权限按进程记录，下次直接使用。
+        
+        Args:
+            process (tuple): (进程ID, 创建时间)
+            now (float): 本轮清理开始时间，用于记录无法打开的进程
+        """
+        pid = process[0]
         try:
-            logger.debug("清理系统缓存")
-            
-            # 获取清理前的可用内存
-            before_available = self._get_memory_before_clean()
-            
-            # 创建系统文件缓存信息结构
-            info = SYSTEM_FILECACHE_INFORMATION()
-            info.MinimumWorkingSet = -1
-            info.MaximumWorkingSet = -1
-            
-            # 设置系统信息
-            status = self.NtSetSystemInformation(
-                SystemFileCacheInformation,
-                byref(info),
-                sizeof(SYSTEM_FILECACHE_INFORMATION)
-            )
-            
-            if status == 0:
-                logger.debug("清理系统缓存API调用成功")
+            known_mask = self._pid_access_masks.get(process)
+            if known_mask is None:
+                access_masks = TRIM_ACCESS_MASKS
             else:
-                logger.warning(f"清理系统缓存API调用失败，错误码: {status}")
+                access_masks = (known_mask,) + tuple(m for m in TRIM_ACCESS_MASKS if m != known_mask)
             
-            # 计算清理的内存量
-            after_available = self._get_memory_before_clean()
-            cleaned_mb = max(0, (after_available - before_available) / (1024 * 1024))
-            self._record_cleaned_memory(cleaned_mb)
-            logger.debug(f"清理系统缓存完成，释放了 {cleaned_mb:.2f}MB 内存")
+            handle = None
+            for access_mask in access_masks:
+                handle = self._OpenProcess(access_mask, False, pid)
+                if handle:
+                    self._pid_access_masks[process] = access_mask
+                    break
             
-            return cleaned_mb
+            if not handle:
+                # 记录无法打开的进程，有效期内不再尝试
+                self._unreachable_pids[process] = now
+                return
             
-        except Exception as e:
-            logger.error(f"清理系统缓存失败: {str(e)}")
-            return 0
+            try:
+                self._EmptyWorkingSet(handle)
+            finally:
+                self._CloseHandle(handle)
+        except Exception:
+            # 忽略无法清理的进程
+            pass
+    
+    def flush_system_buffer(self):
+        """清理系统缓存"""
+        return self._run_clean({"cache"}, "清理系统缓存")
     
     def clean_memory_all(self):
         """全面清理系统内存"""
-        try:
-            logger.debug("全面清理系统内存")
+        return self._run_clean(ALL_CLEAN_STEPS, "全面清理系统内存")
+    
+    def _perform_clean(self, steps):
+        """
+        按 _CLEAN_STEPS 的顺序执行指定的清理步骤（不统计清理量），每个步骤只执行一次
+        
+        全面清理（包含全部步骤）时进程工作集使用系统级命令清理，不受暴力模式和"只清理本程序"设置影响。
+        
+        Args:
+            steps: 清理步骤名集合，取值范围见 ALL_CLEAN_STEPS
+        """
+        full_clean = steps >= ALL_CLEAN_STEPS
+        for name, info_class, command, description in _CLEAN_STEPS:
+            if name not in steps:
+                continue
             
-            # 获取清理前的可用内存
-            before_available = self._get_memory_before_clean()
+            if name == "workingsets" and not full_clean:
+                # 单独清理进程工作集时按暴力模式/权限选择清理方式，自行记录日志
+                self._trim_working_set()
+                continue
             
-            # 1. 合并物理内存 (Windows 8+)
             try:
-                combine_info = MEMORY_COMBINE_INFORMATION_EX()
-                status = self.NtSetSystemInformation(
-                    SystemCombinePhysicalMemoryInformation,
-                    byref(combine_info),
-                    sizeof(MEMORY_COMBINE_INFORMATION_EX)
-                )
+                status = self._run_clean_step(info_class, command)
                 if status == 0:
-                    logger.debug(f"合并物理内存成功，合并了 {combine_info.PagesCombined} 页")
+                    logger.debug("{}成功", description)
                 else:
-                    logger.warning(f"合并物理内存失败，错误码: {status}")
+                    logger.warning("{}失败，错误码: {}", description, status)
             except Exception as e:
-                logger.debug(f"合并物理内存失败 (可能系统版本不支持): {str(e)}")
-            
-            # 2. 清理系统工作集
-            info = SYSTEM_FILECACHE_INFORMATION()
-            info.MinimumWorkingSet = -1
-            info.MaximumWorkingSet = -1
-            status = self.NtSetSystemInformation(
-                SystemFileCacheInformation,
-                byref(info),
-                sizeof(SYSTEM_FILECACHE_INFORMATION)
-            )
-            if status == 0:
-                logger.debug("清理系统工作集成功")
-            else:
-                logger.warning(f"清理系统工作集失败，错误码: {status}")
-            
-            # 3. 清理进程工作集
-            command = MemoryEmptyWorkingSets
-            status = self.NtSetSystemInformation(
-                SystemMemoryListInformation,
-                byref(wintypes.ULONG(command)),
-                sizeof(wintypes.ULONG)
-            )
-            if status == 0:
-                logger.debug("清理进程工作集成功")
-            else:
-                logger.warning(f"清理进程工作集失败，错误码: {status}")
-            
-            # 4. 清理低优先级待机列表
-            command = MemoryPurgeLowPriorityStandbyList
-            status = self.NtSetSystemInformation(
-                SystemMemoryListInformation,
-                byref(wintypes.ULONG(command)),
-                sizeof(wintypes.ULONG)
-            )
-            if status == 0:
-                logger.debug("清理低优先级待机列表成功")
-            else:
-                logger.warning(f"清理低优先级待机列表失败，错误码: {status}")
-            
-            # 5. 清理待机列表
-            command = MemoryPurgeStandbyList
-            status = self.NtSetSystemInformation(
-                SystemMemoryListInformation,
-                byref(wintypes.ULONG(command)),
-                sizeof(wintypes.ULONG)
-            )
-            if status == 0:
-                logger.debug("清理待机列表成功")
-            else:
-                logger.warning(f"清理待机列表失败，错误码: {status}")
-            
-            # 6. 清理修改页面列表
-            command = MemoryFlushModifiedList
-            status = self.NtSetSystemInformation(
-                SystemMemoryListInformation,
-                byref(wintypes.ULONG(command)),
-                sizeof(wintypes.ULONG)
-            )
-            if status == 0:
-                logger.debug("清理修改页面列表成功")
-            else:
-                logger.warning(f"清理修改页面列表失败，错误码: {status}")
-            
-            # 计算清理的内存量
-            after_available = self._get_memory_before_clean()
-            cleaned_mb = max(0, (after_available - before_available) / (1024 * 1024))
-            self._record_cleaned_memory(cleaned_mb)
-            logger.debug(f"全面清理系统内存完成，释放了 {cleaned_mb:.2f}MB 内存")
-            
-            return cleaned_mb
+                # 合并物理内存需要Windows 8+，其余步骤失败也不影响后续步骤
+                logger.debug("{}失败: {}", description, e)
+    
+    def _run_clean_step(self, info_class, command):
+        """
+        按系统信息类选择对应的参数缓冲区执行一个清理步骤
+        
+        Args:
+            info_class (int): 系统信息类
+            command (int): 内存列表命令，仅 SystemMemoryListInformation 使用
             
-        except Exception as e:
-            logger.error(f"全面清理系统内存失败: {str(e)}")
-            return 0
+        Returns:
+            int: NTSTATUS状态码
+        """
+        if info_class == SystemMemoryListInformation:
+            return self._set_memory_list_command(command)
+        if info_class == SystemFileCacheInformation:
+            return self._set_file_cache_limits()
+        return self._combine_physical_memory()
     
     def get_system_cache_info(self):
         """获取系统缓存信息"""
@@ -466,7 +805,7 @@ class MemoryCleanerManager:
             return None
         
         except Exception as e:
-            logger.error(f"获取系统缓存信息失败: {str(e)}")
+            logger.error("获取系统缓存信息失败: {}", e)
             return None
     
     def get_memory_info(self):
@@ -480,7 +819,7 @@ class MemoryCleanerManager:
                 'percent': mem.percent
             }
         except Exception as e:
-            logger.error(f"获取内存信息失败: {str(e)}")
+            logger.error("获取内存信息失败: {}", e)
             return None
     
     def start_cleaner_thread(self):
@@ -490,12 +829,17 @@ class MemoryCleanerManager:
             return
         
         # 检查是否有任何清理选项被启用
-        if not any(self.clean_switches):
+        if not self._switch_mask:
             logger.debug("未启动内存清理线程，因为未启用任何清理选项")
             return
         
         self.running = True
-        self._clean_thread = threading.Thread(target=self._cleaner_thread_func, daemon=True)
+        self._stop_event = threading.Event()
+        self._clean_thread = threading.Thread(
+            target=self._cleaner_thread_func,
+            args=(self._stop_event,),
+            daemon=True
+        )
         self._clean_thread.start()
         logger.debug("内存清理线程已启动")
     
@@ -505,109 +849,117 @@ class MemoryCleanerManager:
             return
             
         self.running = False
+        self._stop_event.set()
+        self._config_changed.set()  # 唤醒正在等待配置变化的线程
         
-        logger.debug("内存清理线程停止标志已设置，线程将在下次循环时退出")
+        logger.debug("内存清理线程停止事件已设置，线程将立即退出")
         
         # 线程是daemon线程，程序退出时会自动结束
     
-    def _cleaner_thread_func(self):
-        """内存清理线程函数"""
+    def _cleaner_thread_func(self, stop_event):
+        """
+        内存清理线程函数
+        
+        每轮结束后计算下一次需要执行工作的时间点（定时清理到期或阈值检查到期），
+        一次性等待到该时间点，而不是按固定间隔轮询。配置变化时提前唤醒重新计算，
+        未启用任何清理选项时一直等待配置变化。
+        
+        Args:
+            stop_event (threading.Event): 停止事件，设置后线程立即退出
+        """
         last_clean_time = time.time()
+        next_threshold_check = last_clean_time
         
-        while self.running:
+        while not stop_event.is_set():
             try:
+                # 先清除事件再读取配置，读取之后的配置变化会再次唤醒线程
+                self._config_changed.clear()
+                
                 cleaned = False
                 current_time = time.time()
                 
-                # 检查是否有任何清理选项被启用
-                any_option_enabled = any(self.clean_switches)
+                has_interval = self._has_interval
+                has_threshold = self._has_threshold
+                
+                # 定时清理
+                if has_interval and current_time - last_clean_time >= self.clean_interval:
+                    logger.debug("定时内存清理触发，距上次清理: {:.0f}秒", current_time - last_clean_time)
+                    
+                    self._run_switched_cleaners(0, "定时内存清理")
+                    
+                    last_clean_time = current_time
+                    cleaned = True
                 
-                # 只有在至少启用了一个清理选项的情况下才执行清理
-                if any_option_enabled:
-                    # 定时清理
-                    if self.clean_switches[0] or self.clean_switches[1] or self.clean_switches[2]:
-                        if current_time - last_clean_time > self.clean_interval:
-                            logger.debug(f"定时内存清理触发，距上次清理: {int(current_time - last_clean_time)}秒")
-                            
-                            # 清理进程工作集
-                            if self.clean_switches[0]:
-                                self.trim_process_working_set()
-                            
-                            # 清理系统缓存
-                            if self.clean_switches[1]:
-                                self.flush_system_buffer()
-                            
-                            # 全面清理
-                            if self.clean_switches[2]:
-                                self.clean_memory_all()
-                            
-                            last_clean_time = current_time
-                            cleaned = True
+                # 内存使用率触发清理，只在冷却时间结束时采样一次内存
+                if (not cleaned and has_threshold and
+                    current_time >= next_threshold_check and
+                    current_time - self._last_threshold_clean > self.cooldown_time):  # 确保冷却时间已过
                     
-                    # 内存使用率触发清理
-                    if (not cleaned and 
-                        (self.clean_switches[3] or self.clean_switches[4] or self.clean_switches[5]) and
-                        (current_time - self._last_threshold_clean > self.cooldown_time)):  # 确保冷却时间已过
+                    mem_info = self.get_memory_info()
+                    
+                    if mem_info and mem_info['percent'] >= self.threshold:
+                        logger.debug("内存使用率触发清理，当前使用率: {}%，阈值: {}%", mem_info['percent'], self.threshold)
                         
-                        mem_info = self.get_memory_info()
+                        self._run_switched_cleaners(3, "阈值内存清理")
                         
-                        if mem_info and mem_info['percent'] >= self.threshold:
-                            logger.debug(f"内存使用率触发清理，当前使用率: {mem_info['percent']}%，阈值: {self.threshold}%")
-                            
-                            # 清理进程工作集
-                            if self.clean_switches[3]:
-                                self.trim_process_working_set()
-                            
-                            # 清理系统缓存
-                            if self.clean_switches[4]:
-                                self.flush_system_buffer()
-                            
-                            # 全面清理
-                            if self.clean_switches[5]:
-                                self.clean_memory_all()
-                            
-                            # 更新最后一次基于阈值的清理时间
-                            self._last_threshold_clean = current_time
+                        # 更新最后一次基于阈值的清理时间
+                        self._last_threshold_clean = current_time
+                    
+                    next_threshold_check = current_time + self.cooldown_time
+                
+                if not has_interval and not has_threshold:
+                    # 没有启用任何清理选项，等待配置变化
+                    timeout = None
                 else:
-                    # 没有启用任何清理选项，记录日志并等待
-                    if hasattr(self, '_last_no_option_warning') and current_time - self._last_no_option_warning < 60:
-                        pass  # 一分钟内不重复记录日志
-                    else:
-                        logger.debug("内存清理已启用，但未勾选任何清理选项，清理线程处于空闲状态")
-                        self._last_no_option_warning = current_time
+                    # 计算下一次需要工作的时间点
+                    deadlines = []
+                    if has_interval:
+                        deadlines.append(last_clean_time + self.clean_interval)
+                    if has_threshold:
+                        deadlines.append(max(next_threshold_check,
+                                             self._last_threshold_clean + self.cooldown_time))
+                    timeout = max(1.0, min(deadlines) - time.time())
                 
-                # 使用短时间的多次休眠替代长时间休眠，以便能更快响应停止命令
-                for _ in range(15):
-                    if not self.running:
-                        break
-                    time.sleep(1)
+                # 等待到下一个时间点，配置变化或停止线程时立即返回
+                self._config_changed.wait(timeout)
                 
             except Exception as e:
-                logger.error(f"内存清理线程出现异常: {str(e)}")
-                # 出错后延长休眠时间，但也分成短循环以便响应停止
-                for _ in range(30):
-                    if not self.running:
-                        break
-                    time.sleep(2)
+                logger.error("内存清理线程出现异常: {}", e)
+                # 出错后延长等待时间
+                if stop_event.wait(60):
+                    break
+    
+    def _run_switched_cleaners(self, first_switch, description):
+        """
+        执行一组开关（工作集、系统缓存、全面清理）中已启用的清理操作，
+        各开关的步骤合并后执行，重复的步骤只执行一次
+        
+        Args:
+            first_switch (int): 该组第一个开关的索引（定时清理为0，阈值清理为3）
+            description (str): 清理操作描述，用于日志
+        """
+        steps = set()
+        for i, switch_steps in enumerate(_SWITCH_STEPS):
+            if self.clean_switches[first_switch + i]:
+                steps |= switch_steps
+        if steps:
+            self._run_clean(steps, description)
     
     def manual_clean(self):
-        """手动执行内存清理"""
+        """
+        手动执行全面内存清理
+        
+        Returns:
+            float: 释放的内存量(MB)，清理失败时为0
+        """
         try:
             logger.debug("执行手动内存清理")
             
-            # 清理进程工作集
-            self.trim_process_working_set()
-            
-            # 清理系统缓存
-            self.flush_system_buffer()
-            
-            # 全面清理
-            self.clean_memory_all()
-            
-            return True
+            # 执行全部清理步骤，每个步骤只执行一次，只统计一次清理量
+            return self._run_clean(ALL_CLEAN_STEPS, "手动内存清理")
         except Exception as e:
-            logger.error(f"手动内存清理失败: {str(e)}")
-            return False
+            logger.error("手动内存清理失败: {}", e)
+            return 0
     
     def set_clean_interval(self, seconds):
         """设置清理间隔时间"""
@@ -617,7 +969,8 @@ class MemoryCleanerManager:
             logger.warning("清理间隔不能小于60秒，已自动调整为60秒")
         
         self.clean_interval = seconds
-        logger.debug(f"内存清理间隔已设置为 {seconds} 秒")
+        self._config_changed.set()
+        logger.debug("内存清理间隔已设置为 {} 秒", seconds)
         self.sync_to_config_manager()
         return True
     
@@ -632,7 +985,8 @@ class MemoryCleanerManager:
             logger.warning("内存占用触发阈值不能大于95%，已自动调整为95%")
             
         self.threshold = percent
-        logger.debug(f"内存占用触发阈值已设置为 {percent}%")
+        self._config_changed.set()
+        logger.debug("内存占用触发阈值已设置为 {}%", percent)
         self.sync_to_config_manager()
         return True
     
@@ -644,16 +998,15 @@ class MemoryCleanerManager:
             logger.warning("清理冷却时间不能小于30秒，已自动调整为30秒")
         
         self.cooldown_time = seconds
-        logger.debug(f"内存清理冷却时间已设置为 {seconds} 秒")
+        self._config_changed.set()
+        logger.debug("内存清理冷却时间已设置为 {} 秒", seconds)
         self.sync_to_config_manager()
         return True
     
     def get_clean_stats(self):
         """获取内存清理统计信息"""
-        import datetime
-        
-        last_time_str = "从未清理" if not self.last_clean_time else datetime.datetime.fromtimestamp(
-            self.last_clean_time).strftime("%Y-%m-%d %H:%M:%S")
+        last_time_str = "从未清理" if not self.last_clean_time else time.strftime(
+            "%Y-%m-%d %H:%M:%S", time.localtime(self.last_clean_time))
             
         return {
             "total_cleaned_mb": self.total_cleaned_mb,
@@ -662,11 +1015,20 @@ class MemoryCleanerManager:
             "last_clean_time": last_time_str
         }
     
+    def set_self_trim_only(self, enabled):
+        """设置清理工作集时是否只清理本程序"""
+        self.self_trim_only = bool(enabled)
+        logger.debug("只清理本程序工作集已{}", '启用' if self.self_trim_only else '禁用')
+        self.sync_to_config_manager()
+        return True
+    
     def set_clean_option(self, option_index, enabled):
         """设置清理选项状态"""
         if 0 <= option_index < len(self.clean_switches):
             self.clean_switches[option_index] = enabled
-            logger.debug(f"内存清理选项 {option_index + 1} 已{'启用' if enabled else '禁用'}")
+            self._update_switch_mask()
+            logger.debug("内存清理选项 {} 已{}", option_index + 1, '启用' if enabled else '禁用')
+            self._config_changed.set()
             
             # 同步到配置
             self.sync_to_config_manager()
@@ -7,6 +7,7 @@
 
 import os
 import sys
+import atexit
 import queue
 import threading
 import time
@@ -17,6 +18,24 @@ from windows_toasts import InteractableWindowsToaster, Toast, WindowsToaster, To
 # 全局通知对象
 _toaster = None
 
+# 默认通知标题
+DEFAULT_TITLE = "ACE-KILLER 消息通知"
+
+# 通知线程每批最多处理的消息数
+NOTIFICATION_BATCH_SIZE = 16
+
+# 当前运行的通知线程 (线程, 停止事件, 消息队列)
+_active_notification_thread = None
+_notification_lock = threading.Lock()
+
+# 通知音频设置，首次使用时创建
+_AUDIO_SILENT = None
+_AUDIO_AUDIBLE = None
+
+# 图标文件是否存在的缓存 {路径: (是否存在, 检查时间)}
+_icon_exists_cache = {}
+_ICON_EXISTS_TTL = 60
+
 
 def get_toaster():
     """
@@ -31,6 +50,46 @@ def get_toaster():
     return _toaster
 
 
+def _get_audio(silent):
+    """
+    获取通知音频设置（首次使用时创建并缓存）
+    
+    Args:
+        silent (bool): 是否静音
+        
+    Returns:
+        ToastAudio: 音频设置
+    """
+    global _AUDIO_SILENT, _AUDIO_AUDIBLE
+    if silent:
+        if _AUDIO_SILENT is None:
+            _AUDIO_SILENT = ToastAudio(silent=True)
+        return _AUDIO_SILENT
+    if _AUDIO_AUDIBLE is None:
+        _AUDIO_AUDIBLE = ToastAudio()
+    return _AUDIO_AUDIBLE
+
+
+def _icon_exists(icon_path):
+    """
+    检查图标文件是否存在，结果缓存60秒
+    
+    Args:
+        icon_path (str): 图标路径
+        
+    Returns:
+        bool: 图标文件是否存在
+    """
+    now = time.time()
+    cached = _icon_exists_cache.get(icon_path)
+    if cached and now - cached[1] < _ICON_EXISTS_TTL:
+        return cached[0]
+    
+    exists = os.path.exists(icon_path)
+    _icon_exists_cache[icon_path] = (exists, now)
+    return exists
+
+
 def send_notification(title, message, icon_path=None, buttons=None, silent=True):
     """
     发送Windows通知
@@ -46,17 +105,17 @@ def send_notification(title, message, icon_path=None, buttons=None, silent=True)
         toaster = get_toaster()
         
         # 根据silent参数设置音频
-        audio = ToastAudio(silent=True) if silent else ToastAudio()
+        audio = _get_audio(silent)
         
         # 创建Toast对象
         toast = Toast(text_fields=[title, message], audio=audio)
         
         # 添加图标
-        if icon_path and os.path.exists(icon_path):
+        if icon_path and _icon_exists(icon_path):
             try:
                 toast.AddImage(ToastDisplayImage.fromPath(icon_path, position=ToastImagePosition.AppLogo))
             except Exception as e:
-                logger.warning(f"添加图标失败: {str(e)}")
+                logger.warning("添加图标失败: {}", e)
         
         # 添加按钮
         if buttons:
@@ -80,7 +139,7 @@ def send_notification(title, message, icon_path=None, buttons=None, silent=True)
         return False
 
 
-def find_icon_path():
+def _search_icon_path():
     """
     查找应用图标路径
     
@@ -104,10 +163,72 @@ def find_icon_path():
     return None
 
 
+# 应用图标路径，导入时查找一次
+_ICON_PATH = _search_icon_path()
+
+
+def find_icon_path():
+    """
+    获取应用图标路径
+    
+    Returns:
+        str or None: 找到的图标路径，如果未找到则返回None
+    """
+    return _ICON_PATH
+
+
+def _message_key(message):
+    """
+    获取消息的标题和内容，用于合并同一批次中的重复消息
+    
+    Args:
+        message (str or dict): 通知消息
+        
+    Returns:
+        tuple: (标题, 内容)
+    """
+    if isinstance(message, dict):
+        return message.get('title', DEFAULT_TITLE), message.get('message', '')
+    return DEFAULT_TITLE, message
+
+
+def _dispatch_message(message, icon_path=None):
+    """
+    发送一条队列中的通知消息
+    
+    Args:
+        message (str or dict): 通知消息
+        icon_path (str, optional): 默认图标路径
+    """
+    # 支持字符串和字典格式的消息
+    if isinstance(message, str):
+        # 简单字符串消息
+        send_notification(
+            title=DEFAULT_TITLE,
+            message=message,
+            icon_path=icon_path
+        )
+    elif isinstance(message, dict):
+        # 字典格式消息，支持更多自定义选项
+        send_notification(
+            title=message.get('title', DEFAULT_TITLE),
+            message=message.get('message', ''),
+            icon_path=message.get('icon_path', icon_path),
+            buttons=message.get('buttons'),
+            silent=message.get('silent', True)
+        )
+
+
 def notification_thread(message_queue, icon_path=None, stop_event=None):
     """
     通知线程函数，从队列中获取消息并发送通知
     
+    线程阻塞等待队列消息，空闲时不会定时唤醒；
+    stop_notification_thread 会设置停止事件并将其作为退出标记放入队列，线程取到自身的停止事件后退出。
+    队列中其他线程遗留的退出标记会被丢弃。
+    每次唤醒后一次取出队列中积压的消息（最多 NOTIFICATION_BATCH_SIZE 条），
+    同一批次中标题和内容相同的消息只显示一次。
+    
     Args:
         message_queue (queue.Queue): 消息队列
         icon_path (str, optional): 图标路径
@@ -119,38 +240,41 @@ def notification_thread(message_queue, icon_path=None, stop_event=None):
     if stop_event is None:
         stop_event = threading.Event()
     
-    while not stop_event.is_set():
+    shutdown = False
+    while not shutdown and not stop_event.is_set():
+        # 阻塞等待消息，由退出标记唤醒
+        messages = [message_queue.get()]
+        
+        # 取出已积压的其他消息
+        while len(messages) < NOTIFICATION_BATCH_SIZE:
+            try:
+                messages.append(message_queue.get_nowait())
+            except queue.Empty:
+                break
+        
         try:
-            # 获取消息，最多等待0.5秒
-            message = message_queue.get(timeout=0.5)
-            
-            # 支持字符串和字典格式的消息
-            if isinstance(message, str):
-                # 简单字符串消息
-                send_notification(
-                    title="ACE-KILLER 消息通知",
-                    message=message,
-                    icon_path=icon_path
-                )
-            elif isinstance(message, dict):
-                # 字典格式消息，支持更多自定义选项
-                send_notification(
-                    title=message.get('title', "ACE-KILLER 消息通知"),
-                    message=message.get('message', ''),
-                    icon_path=message.get('icon_path', icon_path),
-                    buttons=message.get('buttons'),
-                    silent=message.get('silent', True)
-                )
-            
-            # 标记任务完成
-            message_queue.task_done()
-        except queue.Empty:
-            # 队列为空，继续等待
-            pass
+            sent = set()
+            for message in messages:
+                if message is stop_event:
+                    # 丢弃退出标记之后的消息
+                    shutdown = True
+                    break
+                if isinstance(message, threading.Event):
+                    # 已退出的旧线程遗留的退出标记
+                    continue
+                key = _message_key(message)
+                if key in sent:
+                    continue
+                sent.add(key)
+                _dispatch_message(message, icon_path)
         except Exception as e:
             logger.error(f"处理通知失败: {str(e)}")
             # 尝试短暂休眠以避免CPU占用过高
             time.sleep(0.1)
+        finally:
+            # 每条消息都标记任务完成
+            for _ in messages:
+                message_queue.task_done()
     
     logger.debug("通知线程已终止")
 
@@ -159,6 +283,9 @@ def create_notification_thread(message_queue, icon_path=None):
     """
     创建并启动通知线程
     
+    同一时间只保留一个通知线程：使用同一消息队列重复调用时返回已运行的线程，
+    使用其他队列时先停止旧线程再创建新线程。
+    
     Args:
         message_queue (queue.Queue): 消息队列
         icon_path (str, optional): 图标路径
@@ -166,21 +293,59 @@ def create_notification_thread(message_queue, icon_path=None):
     Returns:
         (threading.Thread, threading.Event): 线程对象和停止事件
     """
-    # 如果未指定图标路径，则尝试查找
-    if icon_path is None:
-        icon_path = find_icon_path()
-    
-    # 创建停止事件
-    stop_event = threading.Event()
+    global _active_notification_thread
     
-    # 创建通知线程
-    thread = threading.Thread(
-        target=notification_thread,
-        args=(message_queue, icon_path, stop_event),
-        daemon=True
-    )
+    with _notification_lock:
+        if _active_notification_thread is not None:
+            thread, stop_event, active_queue = _active_notification_thread
+            if active_queue is message_queue and thread.is_alive() and not stop_event.is_set():
+                return thread, stop_event
+            
+            # 停止旧的通知线程，避免线程累积
+            stop_notification_thread(thread, stop_event, active_queue, timeout=2)
+        
+        # 如果未指定图标路径，则尝试查找
+        if icon_path is None:
+            icon_path = find_icon_path()
+        
+        # 创建停止事件
+        stop_event = threading.Event()
+        
+        # 创建通知线程
+        thread = threading.Thread(
+            target=notification_thread,
+            args=(message_queue, icon_path, stop_event),
+            daemon=True
+        )
+        
+        # 启动线程
+        thread.start()
+        
+        _active_notification_thread = (thread, stop_event, message_queue)
+        return thread, stop_event
+
+
+def stop_notification_thread(thread, stop_event, message_queue, timeout=0.5):
+    """
+    停止通知线程，已停止的线程不会重复处理
     
-    # 启动线程
-    thread.start()
+    Args:
+        thread (threading.Thread): 通知线程
+        stop_event (threading.Event): 停止事件
+        message_queue (queue.Queue): 消息队列
+        timeout (float, optional): 等待线程结束的最长时间（秒）
+    """
+    if stop_event.is_set():
+        return
     
-    return thread, stop_event 
\ No newline at end of file
+    stop_event.set()
+    # 以停止事件本身作为退出标记，唤醒阻塞等待的线程
+    message_queue.put(stop_event)
+    thread.join(timeout=timeout)
+
+
+@atexit.register
+def _stop_active_notification_thread():
+    """程序退出时停止仍在运行的通知线程"""
+    if _active_notification_thread is not None:
+        stop_notification_thread(*_active_notification_thread, timeout=2)
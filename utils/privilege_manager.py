@@ -12,6 +12,26 @@ import win32security
 import win32api
 from utils.logger import logger
 
+# 权限名称对应的LUID缓存，LUID在本次开机期间保持不变
+_LUID_CACHE = {}
+
+
+def _lookup_luid(name):
+    """
+    查找权限名称对应的LUID（带缓存）
+
+    Args:
+        name (str): 权限名称
+
+    Returns:
+        LUID: 权限ID
+    """
+    luid = _LUID_CACHE.get(name)
+    if luid is None:
+        luid = win32security.LookupPrivilegeValue(None, name)
+        _LUID_CACHE[name] = luid
+    return luid
+
 
 class WindowsPrivilegeManager:
     """Windows权限管理器"""
@@ -28,6 +48,9 @@ class WindowsPrivilegeManager:
         if self._initialized:
             return
 
+        # 管理员权限检查结果，进程运行期间不会变化
+        self._is_admin_cached = None
+
         # 权限状态
         self.available_functions = {
             "trim_all_processes": False,
@@ -82,28 +105,21 @@ class WindowsPrivilegeManager:
                 "enhanced": {"total": len(enhanced_privileges), "acquired": 0},
                 "process": {"total": len(process_privileges), "acquired": 0},
             }
-            privilege_details = {}
-
-            # 先请求核心权限 - 单独处理每一个，确保最大成功率
-            for privilege_name in core_privileges:
-                result = self._request_single_privilege(hToken, privilege_name)
-                privilege_details[privilege_name] = result
-                if result["success"]:
-                    privilege_status["core"]["acquired"] += 1
-
-            # 请求增强权限
-            for privilege_name in enhanced_privileges:
-                result = self._request_single_privilege(hToken, privilege_name)
-                privilege_details[privilege_name] = result
-                if result["success"]:
-                    privilege_status["enhanced"]["acquired"] += 1
-
-            # 请求进程管理权限
-            for privilege_name in process_privileges:
-                result = self._request_single_privilege(hToken, privilege_name)
-                privilege_details[privilege_name] = result
-                if result["success"]:
-                    privilege_status["process"]["acquired"] += 1
+
+            # 一次性请求所有权限，部分权限获取失败时再逐个请求
+            privilege_details = self._request_privileges(
+                hToken, core_privileges + enhanced_privileges + process_privileges
+            )
+
+            # 统计各组权限获取情况
+            for group, privileges in (
+                ("core", core_privileges),
+                ("enhanced", enhanced_privileges),
+                ("process", process_privileges),
+            ):
+                privilege_status[group]["acquired"] = sum(
+                    1 for privilege_name in privileges if privilege_details[privilege_name]["success"]
+                )
 
             # 关闭句柄
             win32api.CloseHandle(hToken)
@@ -164,13 +180,94 @@ class WindowsPrivilegeManager:
             self.available_functions = {key: False for key in self.available_functions}
             return {"core": {"acquired": 0}, "enhanced": {"acquired": 0}, "process": {"acquired": 0}}
 
+    def _request_privileges(self, hToken, privilege_names):
+        """
+        通过一次 AdjustTokenPrivileges 调用请求多个权限
+
+        先通过 GetTokenInformation(TokenPrivileges) 查询令牌中的权限：令牌中不存在的权限直接记为失败，
+        已启用的权限直接记为成功，只对已存在但未启用的权限调用 AdjustTokenPrivileges。
+        只有返回 ERROR_NOT_ALL_ASSIGNED（部分权限未获取）时才逐个请求，以确定每个权限的结果
+
+        Args:
+            hToken: 进程令牌句柄
+            privilege_names (list): 权限名称列表
+
+        Returns:
+            dict: {权限名称: 与 _request_single_privilege 相同格式的结果}
+        """
+        # 查询令牌当前拥有的权限 {LUID: 属性}，查询失败时请求全部权限
+        try:
+            token_privileges = dict(win32security.GetTokenInformation(hToken, win32security.TokenPrivileges))
+        except Exception as e:
+            token_privileges = None
+            logger.debug("查询令牌权限失败: {}", e)
+
+        results = {}
+        pending = []
+        new_privileges = []
+        for privilege_name in privilege_names:
+            result = {"name": privilege_name, "success": False, "error_code": None, "error_message": None}
+            try:
+                privilege_id = _lookup_luid(privilege_name)
+            except Exception as e:
+                result["error_message"] = str(e)
+                results[privilege_name] = result
+                logger.debug("请求权限 {} 出现异常: {}", privilege_name, e)
+                continue
+
+            if token_privileges is not None:
+                attributes = token_privileges.get(privilege_id)
+                if attributes is None:
+                    # 令牌中不存在该权限，无法启用
+                    result["error_code"] = 1300  # ERROR_NOT_ALL_ASSIGNED
+                    result["error_message"] = "权限不足，通常只有系统进程才能获取此权限"
+                    results[privilege_name] = result
+                    logger.debug("无法获取权限 {}: 令牌中不存在该权限", privilege_name)
+                    continue
+                if attributes & win32security.SE_PRIVILEGE_ENABLED:
+                    # 权限已启用，无需再次请求
+                    result["success"] = True
+                    result["error_code"] = 0
+                    results[privilege_name] = result
+                    logger.debug("权限已启用: {}", privilege_name)
+                    continue
+
+            pending.append(privilege_name)
+            new_privileges.append((privilege_id, win32security.SE_PRIVILEGE_ENABLED))
+
+        if not pending:
+            return results
+
+        try:
+            win32security.AdjustTokenPrivileges(hToken, False, new_privileges)
+            error_code = win32api.GetLastError()
+        except Exception as e:
+            error_code = None
+            logger.debug("批量请求权限出现异常: {}", e)
+
+        if error_code == 0:
+            for privilege_name in pending:
+                results[privilege_name] = {
+                    "name": privilege_name,
+                    "success": True,
+                    "error_code": 0,
+                    "error_message": None,
+                }
+                logger.debug("成功获取权限: {}", privilege_name)
+        else:
+            # 部分权限未获取或批量请求失败，逐个请求以确定每个权限的结果
+            for privilege_name in pending:
+                results[privilege_name] = self._request_single_privilege(hToken, privilege_name)
+
+        return results
+
     def _request_single_privilege(self, hToken, privilege_name):
         """请求单个权限并返回详细结果"""
         result = {"name": privilege_name, "success": False, "error_code": None, "error_message": None}
 
         try:
             # 查找权限ID
-            privilege_id = win32security.LookupPrivilegeValue(None, privilege_name)
+            privilege_id = _lookup_luid(privilege_name)
 
             # 创建权限结构
             new_privilege = [(privilege_id, win32security.SE_PRIVILEGE_ENABLED)]
@@ -184,27 +281,29 @@ class WindowsPrivilegeManager:
 
             if error_code == 0:
                 result["success"] = True
-                logger.debug(f"成功获取权限: {privilege_name}")
+                logger.debug("成功获取权限: {}", privilege_name)
             else:
                 if error_code == 1300:  # ERROR_NOT_ALL_ASSIGNED
                     result["error_message"] = "权限不足，通常只有系统进程才能获取此权限"
-                    logger.debug(f"无法获取权限 {privilege_name}: 权限不足 (ERROR_NOT_ALL_ASSIGNED)")
+                    logger.debug("无法获取权限 {}: 权限不足 (ERROR_NOT_ALL_ASSIGNED)", privilege_name)
                 else:
                     result["error_message"] = f"错误码: {error_code}"
                     logger.warning(f"无法获取权限 {privilege_name}: 错误码 {error_code}")
 
         except Exception as e:
             result["error_message"] = str(e)
-            logger.debug(f"请求权限 {privilege_name} 出现异常: {str(e)}")
+            logger.debug("请求权限 {} 出现异常: {}", privilege_name, e)
 
         return result
 
     def check_admin_rights(self):
-        """检查当前进程是否拥有管理员权限"""
-        try:
-            return ctypes.windll.shell32.IsUserAnAdmin() != 0
-        except Exception:
-            return False
+        """检查当前进程是否拥有管理员权限（结果缓存，进程运行期间不会变化）"""
+        if self._is_admin_cached is None:
+            try:
+                self._is_admin_cached = ctypes.windll.shell32.IsUserAnAdmin() != 0
+            except Exception:
+                self._is_admin_cached = False
+        return self._is_admin_cached
 
     def request_admin_rights(self):
         """请求提升为管理员权限（此函数需谨慎使用，可能导致程序重启）"""
@@ -270,27 +369,24 @@ class WindowsPrivilegeManager:
         logger.debug(f"  SE_INC_WORKING_SET_NAME = '{win32security.SE_INC_WORKING_SET_NAME}'")
         logger.debug(f"  SE_MANAGE_VOLUME_NAME = '{win32security.SE_MANAGE_VOLUME_NAME}'")
 
-    def log_privilege_status(self):
-        """记录当前权限状态到日志"""
+    def _format_privilege_status(self) -> str:
+        """生成权限状态的多行文本"""
         summary = self.get_privilege_summary()
 
-        logger.info(f"权限管理器状态:")
-        logger.info(f"  管理员权限: {'✅ 是' if summary['is_admin'] else '❌ 否'}")
+        lines = [
+            "权限管理器状态:",
+            f"  管理员权限: {'✅ 是' if summary['is_admin'] else '❌ 否'}",
+            "  功能权限:",
+        ]
 
         # 功能权限状态
-        function_status = []
         for func_name, available in summary["available_functions"].items():
-            status = "✅" if available else "❌"
-            function_status.append(f"    {func_name}: {status}")
-
-        logger.info(f"  功能权限:")
-        for status in function_status:
-            logger.info(status)
+            lines.append(f"    {func_name}: {'✅' if available else '❌'}")
 
         # 权限统计
         if summary["privilege_status"]:
             ps = summary["privilege_status"]
-            logger.info(
+            lines.append(
                 f"  权限统计: 核心({ps['core']['acquired']}/{ps['core']['total']}) "
                 f"增强({ps['enhanced']['acquired']}/{ps['enhanced']['total']}) "
                 f"进程({ps['process']['acquired']}/{ps['process']['total']})"
@@ -298,11 +394,17 @@ class WindowsPrivilegeManager:
 
         # 建议
         if summary["recommendations"]:
-            logger.info("  建议:")
-            for rec in summary["recommendations"]:
-                logger.info(f"    • {rec}")
+            lines.append("  建议:")
+            lines.extend(f"    • {rec}" for rec in summary["recommendations"])
         else:
-            logger.info("  ✅ 权限状态良好")
+            lines.append("  ✅ 权限状态良好")
+
+        return "\n".join(lines)
+
+    def log_privilege_status(self):
+        """记录当前权限状态到日志"""
+        # 合并为一条日志；INFO级别被过滤时不会生成权限摘要
+        logger.opt(lazy=True).info("{}", self._format_privilege_status)
 
         # 调试模式下显示权限常量值
         if logger.level == 10:  # DEBUG level
@@ -8,12 +8,11 @@
 import ctypes
 import time
 import threading
-from typing import Optional, Tuple, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional, Tuple, Dict
 from ctypes import wintypes
-import psutil
 from utils.logger import logger
-from win32api import OpenProcess, CloseHandle
-from win32con import PROCESS_ALL_ACCESS
 from win32process import (
     SetPriorityClass, 
     IDLE_PRIORITY_CLASS, 
@@ -33,12 +32,30 @@ from utils.privilege_manager import get_privilege_manager
 
 # 进程访问权限
 PROCESS_SET_INFORMATION = 0x0200
-PROCESS_QUERY_INFORMATION = 0x0400
-PROCESS_ALL_ACCESS = 0x1F0FFF
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+PROCESS_SET_LIMITED_INFORMATION = 0x2000
+
+# 优化进程所需的最小访问权限（I/O优先级、CPU优先级、亲和性、功耗节流共用一个句柄）
+# SET_INFORMATION: I/O优先级、CPU优先级、亲和性；SET_LIMITED: 功耗节流；QUERY_LIMITED: 进程创建时间
+PROCESS_OPTIMIZE_ACCESS = (PROCESS_SET_INFORMATION | PROCESS_SET_LIMITED_INFORMATION
+                           | PROCESS_QUERY_LIMITED_INFORMATION)
 
 # ProcessInformationClass 枚举
 ProcessIoPriority = 33
 
+# 亲和性掩码位数上限：超过64个逻辑处理器时，SetProcessAffinityMask 只作用于进程所在的处理器组
+MAX_AFFINITY_CPUS = ctypes.sizeof(ctypes.c_size_t) * 8
+
+# 自动优化时跳过已优化进程的最长时间（秒），超时后重新应用，以覆盖进程自行修改的设置
+APPLIED_REFRESH_INTERVAL = 120
+
+# 按名称并发优化进程时的最大线程数
+MAX_OPTIMIZE_WORKERS = 8
+
+# 进程快照
+TH32CS_SNAPPROCESS = 0x00000002
+INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
 # 效能模式相关常量
 PROCESS_POWER_THROTTLING_INFORMATION = 4
 PROCESS_POWER_THROTTLING_EXECUTION_SPEED = 0x1
@@ -69,6 +86,165 @@ class PROCESS_POWER_THROTTLING_STATE(ctypes.Structure):
     ]
 
 
+class PROCESSENTRY32W(ctypes.Structure):
+    """进程快照条目结构体"""
+    _fields_ = [
+        ("dwSize", wintypes.DWORD),
+        ("cntUsage", wintypes.DWORD),
+        ("th32ProcessID", wintypes.DWORD),
+        ("th32DefaultHeapID", ctypes.c_size_t),
+        ("th32ModuleID", wintypes.DWORD),
+        ("cntThreads", wintypes.DWORD),
+        ("th32ParentProcessID", wintypes.DWORD),
+        ("pcPriClassBase", wintypes.LONG),
+        ("dwFlags", wintypes.DWORD),
+        ("szExeFile", wintypes.WCHAR * wintypes.MAX_PATH)
+    ]
+
+
+class SYSTEM_INFO(ctypes.Structure):
+    """系统信息结构体"""
+    _fields_ = [
+        ("wProcessorArchitecture", wintypes.WORD),
+        ("wReserved", wintypes.WORD),
+        ("dwPageSize", wintypes.DWORD),
+        ("lpMinimumApplicationAddress", wintypes.LPVOID),
+        ("lpMaximumApplicationAddress", wintypes.LPVOID),
+        ("dwActiveProcessorMask", ctypes.c_size_t),
+        ("dwNumberOfProcessors", wintypes.DWORD),
+        ("dwProcessorType", wintypes.DWORD),
+        ("dwAllocationGranularity", wintypes.DWORD),
+        ("wProcessorLevel", wintypes.WORD),
+        ("wProcessorRevision", wintypes.WORD)
+    ]
+
+
+# =============================================================================
+# Windows API 函数（模块加载时解析一次）
+# =============================================================================
+
+_NTDLL = ctypes.WinDLL('ntdll.dll', use_last_error=True)
+_KERNEL32 = ctypes.WinDLL('kernel32.dll', use_last_error=True)
+
+
+def _check_bool(result, func, args):
+    """errcheck：返回值为0（FALSE/NULL）时抛出带错误码的OSError"""
+    if not result:
+        raise ctypes.WinError(ctypes.get_last_error())
+    return result
+
+
+_NtSetInformationProcess = _NTDLL.NtSetInformationProcess
+_NtSetInformationProcess.argtypes = [
+    wintypes.HANDLE,    # ProcessHandle
+    ctypes.c_int,       # ProcessInformationClass
+    ctypes.c_void_p,    # ProcessInformation
+    ctypes.c_ulong      # ProcessInformationLength
+]
+_NtSetInformationProcess.restype = ctypes.c_ulong
+
+_OpenProcess = _KERNEL32.OpenProcess
+_OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+_OpenProcess.restype = wintypes.HANDLE
+_OpenProcess.errcheck = _check_bool
+
+_CloseHandle = _KERNEL32.CloseHandle
+_CloseHandle.argtypes = [wintypes.HANDLE]
+_CloseHandle.restype = wintypes.BOOL
+
+_SetProcessInformation = _KERNEL32.SetProcessInformation
+_SetProcessInformation.argtypes = [
+    wintypes.HANDLE,    # hProcess
+    ctypes.c_int,       # ProcessInformationClass
+    ctypes.c_void_p,    # ProcessInformation
+    wintypes.DWORD      # ProcessInformationSize
+]
+_SetProcessInformation.restype = wintypes.BOOL
+_SetProcessInformation.errcheck = _check_bool
+
+_SetProcessAffinityMask = _KERNEL32.SetProcessAffinityMask
+_SetProcessAffinityMask.argtypes = [wintypes.HANDLE, ctypes.c_size_t]
+_SetProcessAffinityMask.restype = wintypes.BOOL
+_SetProcessAffinityMask.errcheck = _check_bool
+
+_GetProcessTimes = _KERNEL32.GetProcessTimes
+_GetProcessTimes.argtypes = [
+    wintypes.HANDLE,
+    ctypes.POINTER(wintypes.FILETIME),  # lpCreationTime
+    ctypes.POINTER(wintypes.FILETIME),  # lpExitTime
+    ctypes.POINTER(wintypes.FILETIME),  # lpKernelTime
+    ctypes.POINTER(wintypes.FILETIME)   # lpUserTime
+]
+_GetProcessTimes.restype = wintypes.BOOL
+_GetProcessTimes.errcheck = _check_bool
+
+_GetSystemInfo = _KERNEL32.GetSystemInfo
+_GetSystemInfo.argtypes = [ctypes.POINTER(SYSTEM_INFO)]
+_GetSystemInfo.restype = None
+
+_CreateToolhelp32Snapshot = _KERNEL32.CreateToolhelp32Snapshot
+_CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+_CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+
+_Process32FirstW = _KERNEL32.Process32FirstW
+_Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+_Process32FirstW.restype = wintypes.BOOL
+
+_Process32NextW = _KERNEL32.Process32NextW
+_Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+_Process32NextW.restype = wintypes.BOOL
+
+
+def _get_cpu_count() -> int:
+    """通过 GetSystemInfo 获取逻辑处理器数量（进程所在处理器组）"""
+    system_info = SYSTEM_INFO()
+    _GetSystemInfo(ctypes.byref(system_info))
+    return system_info.dwNumberOfProcessors or 1
+
+
+# 系统逻辑处理器数量，模块加载时获取一次
+_CPU_COUNT = _get_cpu_count()
+
+
+def _iter_processes():
+    """
+    通过一次 CreateToolhelp32Snapshot 快照遍历所有进程，不需要打开任何进程
+    
+    Yields:
+        tuple: (进程ID, 可执行文件名)
+    """
+    snapshot = _CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if not snapshot or snapshot == INVALID_HANDLE_VALUE:
+        raise ctypes.WinError(ctypes.get_last_error())
+    
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+        entry_ref = ctypes.byref(entry)
+        
+        has_entry = _Process32FirstW(snapshot, entry_ref)
+        while has_entry:
+            yield entry.th32ProcessID, entry.szExeFile
+            has_entry = _Process32NextW(snapshot, entry_ref)
+    finally:
+        _CloseHandle(snapshot)
+
+
+def _iter_pid_by_name(name_lower: str):
+    """
+    查找指定名称的所有进程
+    
+    Args:
+        name_lower: 小写的进程名称
+        
+    Yields:
+        int: 匹配进程的ID
+    """
+    for pid, exe_name in _iter_processes():
+        if exe_name.lower() == name_lower:
+            yield pid
+
+
 # =============================================================================
 # 性能模式配置映射
 # =============================================================================
@@ -76,37 +252,32 @@ class PROCESS_POWER_THROTTLING_STATE(ctypes.Structure):
 class PerformanceModeConfig:
     """性能模式配置类，根据UI要求定义各模式的设置"""
     
+    # 性能模式配置表，按性能模式取值索引：
+    # (CPU优先级, I/O优先级, CPU亲和性策略, 模式描述, 功耗节流状态掩码)
+    MODE_TABLE = (
+        # 效能模式：低优先级、低I/O优先级、绑定到最后一个核心、启用节流
+        (IDLE_PRIORITY_CLASS, IO_PRIORITY_HINT.IoPriorityLow, "last_core", "效能模式",
+         PROCESS_POWER_THROTTLING_EXECUTION_SPEED),
+        # 正常模式：正常优先级、正常I/O优先级、所有核心、禁用节流
+        (NORMAL_PRIORITY_CLASS, IO_PRIORITY_HINT.IoPriorityNormal, "all_cores", "正常模式", 0),
+        # 高性能：高优先级、正常I/O优先级、所有核心、禁用节流
+        (HIGH_PRIORITY_CLASS, IO_PRIORITY_HINT.IoPriorityNormal, "all_cores", "高性能模式", 0),
+        # 最大性能：实时优先级、最高I/O优先级、所有核心、禁用节流
+        (REALTIME_PRIORITY_CLASS, IO_PRIORITY_HINT.IoPriorityCritical, "all_cores", "最大性能模式", 0),
+    )
+    
+    # 以下映射由配置表生成，保留用于兼容
     # 性能模式到CPU优先级的映射
-    CPU_PRIORITY_MAP = {
-        PERFORMANCE_MODE.ECO_MODE: IDLE_PRIORITY_CLASS,           # 效能模式：低优先级
-        PERFORMANCE_MODE.NORMAL_MODE: NORMAL_PRIORITY_CLASS,      # 正常模式：正常优先级  
-        PERFORMANCE_MODE.HIGH_PERFORMANCE: HIGH_PRIORITY_CLASS,   # 高性能：高优先级
-        PERFORMANCE_MODE.MAXIMUM_PERFORMANCE: REALTIME_PRIORITY_CLASS  # 最大性能：实时优先级
-    }
+    CPU_PRIORITY_MAP = {mode: row[0] for mode, row in enumerate(MODE_TABLE)}
     
     # 性能模式到I/O优先级的映射
-    IO_PRIORITY_MAP = {
-        PERFORMANCE_MODE.ECO_MODE: IO_PRIORITY_HINT.IoPriorityLow,         # 效能模式：低I/O优先级
-        PERFORMANCE_MODE.NORMAL_MODE: IO_PRIORITY_HINT.IoPriorityNormal,   # 正常模式：正常I/O优先级
-        PERFORMANCE_MODE.HIGH_PERFORMANCE: IO_PRIORITY_HINT.IoPriorityNormal,  # 高性能：正常I/O优先级
-        PERFORMANCE_MODE.MAXIMUM_PERFORMANCE: IO_PRIORITY_HINT.IoPriorityCritical  # 最大性能：最高I/O优先级
-    }
+    IO_PRIORITY_MAP = {mode: row[1] for mode, row in enumerate(MODE_TABLE)}
     
     # 性能模式到CPU亲和性策略的映射
-    CPU_AFFINITY_MAP = {
-        PERFORMANCE_MODE.ECO_MODE: "last_core",        # 效能模式：绑定到最后一个核心
-        PERFORMANCE_MODE.NORMAL_MODE: "all_cores",     # 正常模式：绑定所有核心
-        PERFORMANCE_MODE.HIGH_PERFORMANCE: "all_cores", # 高性能：绑定所有核心
-        PERFORMANCE_MODE.MAXIMUM_PERFORMANCE: "all_cores"  # 最大性能：绑定所有核心
-    }
+    CPU_AFFINITY_MAP = {mode: row[2] for mode, row in enumerate(MODE_TABLE)}
     
     # 性能模式文本描述
-    MODE_DESCRIPTIONS = {
-        PERFORMANCE_MODE.ECO_MODE: "效能模式",
-        PERFORMANCE_MODE.NORMAL_MODE: "正常模式", 
-        PERFORMANCE_MODE.HIGH_PERFORMANCE: "高性能模式",
-        PERFORMANCE_MODE.MAXIMUM_PERFORMANCE: "最大性能模式"
-    }
+    MODE_DESCRIPTIONS = {mode: row[3] for mode, row in enumerate(MODE_TABLE)}
     
     # CPU优先级名称映射
     PRIORITY_NAMES = {
@@ -119,18 +290,41 @@ class PerformanceModeConfig:
     }
 
 
+_MODE_TABLE = PerformanceModeConfig.MODE_TABLE
+# 性能模式 -> 设置行，按字典查找，非法的模式值（包括非整数）回退为未知模式
+_MODE_ROWS = dict(enumerate(_MODE_TABLE))
+_PRIORITY_NAMES = PerformanceModeConfig.PRIORITY_NAMES
+
+# NTSTATUS错误码说明
+_NTSTATUS_MSGS = {
+    0x00000000: "STATUS_SUCCESS - 操作成功",
+    0xC0000061: "STATUS_PRIVILEGE_NOT_HELD - 权限不足，需要管理员权限",
+    0xC0000005: "STATUS_ACCESS_DENIED - 访问被拒绝",
+    0xC0000008: "STATUS_INVALID_HANDLE - 无效的句柄",
+    0xC000000D: "STATUS_INVALID_PARAMETER - 无效的参数",
+    0xC0000022: "STATUS_ACCESS_DENIED - 访问被拒绝",
+}
+
+
 # =============================================================================
 # 进程I/O优先级管理器
 # =============================================================================
 
 class ProcessIoPriorityManager:
-    """处理进程I/O优先级管理的类"""
+    """处理进程I/O优先级管理的类（单例）"""
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ProcessIoPriorityManager, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
     
     def __init__(self):
         """初始化进程优先级管理器"""
-        # 加载Windows API
-        self.ntdll = ctypes.WinDLL('ntdll.dll')
-        self.kernel32 = ctypes.WinDLL('kernel32.dll')
+        if self._initialized:
+            return
         
         # 获取权限管理器
         self.privilege_manager = get_privilege_manager()
@@ -138,26 +332,34 @@ class ProcessIoPriorityManager:
         # 性能配置
         self.config = PerformanceModeConfig()
         
-        # 初始化Windows API函数
-        self._init_api_functions()
-        
         # 检查权限
         self._check_privileges()
         
-        # 缓存系统CPU核心数
-        self._cpu_count = psutil.cpu_count(logical=True)
-    
-    def _init_api_functions(self):
-        """初始化Windows API函数"""
-        # 定义NtSetInformationProcess函数
-        self.NtSetInformationProcess = self.ntdll.NtSetInformationProcess
-        self.NtSetInformationProcess.argtypes = [
-            wintypes.HANDLE,    # ProcessHandle
-            ctypes.c_int,       # ProcessInformationClass
-            ctypes.c_void_p,    # ProcessInformation
-            ctypes.c_ulong      # ProcessInformationLength
-        ]
-        self.NtSetInformationProcess.restype = ctypes.c_ulong
+        # 预先计算CPU亲和性掩码：所有核心、仅最后一个核心（限制在一个处理器组内）
+        self._affinity_cpu_count = min(_CPU_COUNT, MAX_AFFINITY_CPUS)
+        self._mask_all = (1 << self._affinity_cpu_count) - 1
+        self._mask_last_core = 1 << (self._affinity_cpu_count - 1)
+        
+        # 预分配API参数缓冲区，每次调用只修改字段值（并发优化时由锁保护）
+        self._buf_lock = threading.Lock()
+        self._io_prio_buf = ctypes.c_int(0)
+        self._io_prio_size = ctypes.sizeof(self._io_prio_buf)
+        self._io_prio_ref = ctypes.byref(self._io_prio_buf)
+        self._throttling = PROCESS_POWER_THROTTLING_STATE()
+        self._throttling.Version = 1
+        self._throttling.ControlMask = PROCESS_POWER_THROTTLING_EXECUTION_SPEED
+        self._throttling_size = ctypes.sizeof(self._throttling)
+        self._throttling_ref = ctypes.byref(self._throttling)
+        
+        # 自动优化已处理的进程 {pid: ((创建时间, 性能模式, I/O优先级), 优化时间)}
+        # 仅 apply_modes 使用：设置未变化且未超过 APPLIED_REFRESH_INTERVAL 时跳过
+        self._applied = {}
+        self._applied_lock = threading.Lock()
+        
+        # 每种性能模式预先生成一个优化函数，模式设置作为闭包变量绑定
+        self._apply_by_mode = {mode: self._make_applier(mode) for mode in _MODE_ROWS}
+        
+        self._initialized = True
     
     def _check_privileges(self):
         """检查并记录权限状态"""
@@ -177,38 +379,117 @@ class ProcessIoPriorityManager:
             priority: I/O优先级（如果为None，则根据性能模式自动确定）
             performance_mode: 性能模式
             
+        Returns:
+            bool: 操作是否成功
+        """
+        # 未指定I/O优先级时直接使用该模式预先生成的优化函数
+        if priority is None:
+            apply = self._apply_by_mode.get(performance_mode)
+            if apply is not None:
+                return apply(process_id)
+        
+        # 一次取出性能模式的全部设置
+        row = _MODE_ROWS.get(performance_mode)
+        if row is not None:
+            cpu_priority, io_priority, affinity_strategy, mode_text, throttle_mask = row
+        else:
+            cpu_priority, io_priority, affinity_strategy, throttle_mask = (
+                NORMAL_PRIORITY_CLASS, IO_PRIORITY_HINT.IoPriorityLow, "all_cores", 0
+            )
+            mode_text = f"未知模式({performance_mode})"
+        
+        # 根据性能模式自动确定I/O优先级（如果未指定）
+        if priority is None:
+            priority = io_priority
+        
+        return self._apply_settings(process_id, performance_mode, priority, cpu_priority,
+                                    affinity_strategy, throttle_mask, mode_text)
+    
+    def _make_applier(self, performance_mode: int):
+        """
+        生成指定性能模式的优化函数
+        
+        Returns:
+            callable: 接收进程ID并返回是否成功的函数
+        """
+        cpu_priority, io_priority, affinity_strategy, mode_text, throttle_mask = _MODE_ROWS[performance_mode]
+        apply_settings = self._apply_settings
+        
+        def apply(process_id: int, skip_applied: bool = False) -> bool:
+            return apply_settings(process_id, performance_mode, io_priority, cpu_priority,
+                                  affinity_strategy, throttle_mask, mode_text, skip_applied)
+        
+        return apply
+    
+    def _apply_settings(self, process_id: int, performance_mode: int, priority: int, cpu_priority: int,
+                        affinity_strategy: str, throttle_mask: int, mode_text: str,
+                        skip_applied: bool = False) -> bool:
+        """
+        按给定设置优化进程：I/O优先级、CPU优先级、亲和性、功耗节流
+        
+        Args:
+            skip_applied: 同一进程近期已按相同设置优化时跳过（仅自动优化使用，手动操作总是重新应用）
+        
         Returns:
             bool: 操作是否成功
         """
         try:
-            # 根据性能模式自动确定I/O优先级（如果未指定）
-            if priority is None:
-                priority = self.config.IO_PRIORITY_MAP.get(performance_mode, IO_PRIORITY_HINT.IoPriorityLow)
+            logger.debug("开始优化进程(PID={}) - {}", process_id, mode_text)
             
-            mode_text = self.config.MODE_DESCRIPTIONS.get(performance_mode, f"未知模式({performance_mode})")
-            logger.debug(f"开始优化进程(PID={process_id}) - {mode_text}")
+            # 打开一次进程句柄，所有优化步骤共用
+            try:
+                process_handle = _OpenProcess(PROCESS_OPTIMIZE_ACCESS, False, process_id)
+            except OSError as e:
+                error_code = e.winerror
+                if error_code == 87:  # ERROR_INVALID_PARAMETER，进程已退出
+                    with self._applied_lock:
+                        self._applied.pop(process_id, None)
+                self._log_process_error(process_id, error_code, "打开进程")
+                return False
             
             # 执行优化步骤
             results = {}
-            
-            # 1. 设置I/O优先级
-            results['io'] = self._set_io_priority(process_id, priority)
-            if not results['io']:
-                logger.error(f"设置进程(PID={process_id})I/O优先级失败")
-                return False
-            
-            # 2. 设置CPU优先级
-            results['cpu'] = self._set_cpu_priority(process_id, performance_mode)
-            
-            # 3. 设置CPU亲和性
-            results['affinity'] = self._set_cpu_affinity_by_mode(process_id, performance_mode)
-            
-            # 4. 设置功耗节流模式
-            results['power'] = self._set_power_throttling(process_id, performance_mode)
+            try:
+                # 同一进程（PID和创建时间相同）近期已按相同设置优化过时直接返回
+                create_time = None
+                if skip_applied:
+                    create_time = self._get_create_time(process_handle)
+                    applied_key = (create_time, performance_mode, priority)
+                    now = time.monotonic()
+                    with self._applied_lock:
+                        applied = self._applied.get(process_id)
+                    if (create_time is not None and applied is not None and applied[0] == applied_key
+                            and now - applied[1] < APPLIED_REFRESH_INTERVAL):
+                        logger.debug("进程(PID={})已优化为{}，跳过", process_id, mode_text)
+                        return True
+                
+                # 1. 设置I/O优先级
+                results['io'] = self._set_io_priority(process_handle, process_id, priority)
+                if not results['io']:
+                    logger.error(f"设置进程(PID={process_id})I/O优先级失败")
+                    return False
+                
+                # 2. 设置CPU优先级
+                results['cpu'] = self._set_cpu_priority(process_handle, process_id, cpu_priority)
+                
+                # 3. 设置CPU亲和性
+                results['affinity'] = self._set_cpu_affinity_by_mode(process_handle, process_id, affinity_strategy)
+                
+                # 4. 设置功耗节流模式
+                results['power'] = self._set_power_throttling(process_handle, process_id, throttle_mask, mode_text)
+                
+                # I/O优先级设置成功即记录为已优化
+                if create_time is not None:
+                    with self._applied_lock:
+                        self._applied[process_id] = (applied_key, now)
+            finally:
+                _CloseHandle(process_handle)
             
             # 记录结果
             success_count = sum(1 for success in results.values() if success)
-            logger.debug(f"进程优化完成(PID={process_id}): {success_count}/4 项成功 - I/O={results['io']}, CPU={results['cpu']}, 亲和性={results['affinity']}, 功耗={results['power']} ({mode_text})")
+            logger.debug("进程优化完成(PID={}): {}/4 项成功 - I/O={}, CPU={}, 亲和性={}, 功耗={} ({})",
+                         process_id, success_count, results['io'], results['cpu'],
+                         results['affinity'], results['power'], mode_text)
             
             # 只要I/O优先级设置成功就认为操作成功
             return results['io']
@@ -217,157 +498,130 @@ class ProcessIoPriorityManager:
             logger.error(f"设置进程优化时发生错误: {str(e)}")
             return False
     
-    def _set_io_priority(self, process_id: int, priority: int) -> bool:
+    def _get_create_time(self, process_handle) -> Optional[int]:
+        """
+        获取进程创建时间，用于区分复用了相同PID的不同进程
+        
+        Returns:
+            int: 创建时间（FILETIME数值），获取失败时返回None
+        """
+        creation_time = wintypes.FILETIME()
+        exit_time = wintypes.FILETIME()
+        kernel_time = wintypes.FILETIME()
+        user_time = wintypes.FILETIME()
+        try:
+            _GetProcessTimes(process_handle, ctypes.byref(creation_time), ctypes.byref(exit_time),
+                             ctypes.byref(kernel_time), ctypes.byref(user_time))
+        except OSError:
+            return None
+        return (creation_time.dwHighDateTime << 32) | creation_time.dwLowDateTime
+    
+    def _set_io_priority(self, process_handle, process_id: int, priority: int) -> bool:
         """设置I/O优先级"""
-        process_handle = None
         try:
-            # 打开进程句柄
-            process_handle = self.kernel32.OpenProcess(
-                PROCESS_SET_INFORMATION | PROCESS_QUERY_INFORMATION,
-                False,
-                process_id
-            )
-            
-            if not process_handle:
-                error_code = ctypes.GetLastError()
-                self._log_process_error(process_id, error_code, "打开进程")
-                return False
-            
-            # 设置优先级值
-            priority_value = ctypes.c_int(priority)
-            
-            # 调用API设置I/O优先级
-            status = self.NtSetInformationProcess(
-                process_handle,
-                ProcessIoPriority,
-                ctypes.byref(priority_value),
-                ctypes.sizeof(priority_value)
-            )
+            with self._buf_lock:
+                # 设置优先级值
+                self._io_prio_buf.value = priority
+                
+                # 调用API设置I/O优先级
+                status = _NtSetInformationProcess(
+                    process_handle,
+                    ProcessIoPriority,
+                    self._io_prio_ref,
+                    self._io_prio_size
+                )
             
             if status != 0:
                 error_message = self._get_ntstatus_message(status)
                 logger.error(f"设置进程(PID={process_id})I/O优先级失败，{error_message}")
                 return False
             
-            logger.debug(f"成功设置进程(PID={process_id})的I/O优先级为: {priority}")
+            logger.debug("成功设置进程(PID={})的I/O优先级为: {}", process_id, priority)
             return True
             
         except Exception as e:
             logger.error(f"设置I/O优先级时发生错误: {str(e)}")
             return False
-        finally:
-            if process_handle:
-                self.kernel32.CloseHandle(process_handle)
     
-    def _set_cpu_priority(self, process_id: int, performance_mode: int) -> bool:
-        """根据性能模式设置CPU优先级"""
+    def _set_cpu_priority(self, process_handle, process_id: int, priority_class: int) -> bool:
+        """设置CPU优先级"""
         try:
-            # 获取对应的优先级类
-            priority_class = self.config.CPU_PRIORITY_MAP.get(performance_mode, NORMAL_PRIORITY_CLASS)
-            
             # 实时优先级警告
-            if performance_mode == PERFORMANCE_MODE.MAXIMUM_PERFORMANCE:
+            if priority_class == REALTIME_PRIORITY_CLASS:
                 logger.warning(f"正在为进程(PID={process_id})设置实时优先级，这可能影响系统稳定性")
             
-            # 打开进程并设置优先级
-            handle = OpenProcess(PROCESS_ALL_ACCESS, False, process_id)
-            if not handle:
-                logger.error(f"无法打开进程(PID={process_id})用于设置CPU优先级")
-                return False
-            
-            try:
-                SetPriorityClass(handle, priority_class)
-                priority_name = self.config.PRIORITY_NAMES.get(priority_class, f"未知({priority_class})")
-                logger.debug(f"成功设置进程(PID={process_id})的CPU优先级为: {priority_name}")
-                return True
-            finally:
-                CloseHandle(handle)
+            SetPriorityClass(process_handle, priority_class)
+            # 优先级名称仅在输出调试日志时才查询
+            logger.debug(
+                "成功设置进程(PID={})的CPU优先级为: {}", process_id,
+                _PRIORITY_NAMES.get(priority_class) or f"未知({priority_class})"
+            )
+            return True
                 
         except Exception as e:
             logger.error(f"设置CPU优先级时发生错误: {str(e)}")
             return False
     
-    def _set_cpu_affinity_by_mode(self, process_id: int, performance_mode: int) -> bool:
-        """根据性能模式设置CPU亲和性"""
+    def _set_cpu_affinity_by_mode(self, process_handle, process_id: int, affinity_strategy: str) -> bool:
+        """根据性能模式的亲和性策略设置CPU亲和性"""
         try:
-            affinity_strategy = self.config.CPU_AFFINITY_MAP.get(performance_mode, "all_cores")
-            
-            if self._cpu_count <= 1:
-                logger.debug(f"系统只有一个核心，跳过CPU亲和性设置(PID={process_id})")
+            if _CPU_COUNT <= 1:
+                logger.debug("系统只有一个核心，跳过CPU亲和性设置(PID={})", process_id)
                 return True
             
-            proc = psutil.Process(process_id)
-            
             if affinity_strategy == "last_core":
                 # 效能模式：绑定到最后一个核心
-                last_core = self._cpu_count - 1
-                proc.cpu_affinity([last_core])
-                logger.debug(f"成功设置进程(PID={process_id})的CPU亲和性到核心{last_core}")
+                mask = self._mask_last_core
             else:  # "all_cores"
                 # 其他模式：绑定到所有核心
-                all_cores = list(range(self._cpu_count))
-                proc.cpu_affinity(all_cores)
-                logger.debug(f"成功设置进程(PID={process_id})的CPU亲和性到所有核心")
+                mask = self._mask_all
             
+            _SetProcessAffinityMask(process_handle, mask)
+            
+            if affinity_strategy == "last_core":
+                logger.debug("成功设置进程(PID={})的CPU亲和性到核心{}", process_id, self._affinity_cpu_count - 1)
+            else:
+                logger.debug("成功设置进程(PID={})的CPU亲和性到所有核心", process_id)
             return True
             
+        except OSError as e:
+            logger.error(f"设置进程(PID={process_id})CPU亲和性失败，错误码: {e.winerror}")
+            return False
         except Exception as e:
             logger.error(f"设置CPU亲和性时发生错误: {str(e)}")
             return False
     
-    def _set_power_throttling(self, process_id: int, performance_mode: int) -> bool:
-        """设置进程的功耗节流模式"""
-        process_handle = None
+    def _set_power_throttling(self, process_handle, process_id: int, throttle_mask: int, mode_text: str) -> bool:
+        """
+        设置进程的功耗节流模式
+        
+        Args:
+            throttle_mask: 节流状态掩码，效能模式启用节流，其他模式为0（禁用节流）
+            mode_text: 性能模式描述，用于日志
+        """
         try:
-            # 打开进程句柄
-            process_handle = self.kernel32.OpenProcess(PROCESS_ALL_ACCESS, False, process_id)
-            if not process_handle:
-                logger.error(f"无法打开进程(PID={process_id})句柄用于设置功耗模式")
-                return False
-            
-            # 创建功耗节流状态结构体
-            throttling_state = PROCESS_POWER_THROTTLING_STATE()
-            throttling_state.Version = 1
-            throttling_state.ControlMask = PROCESS_POWER_THROTTLING_EXECUTION_SPEED
-            
-            # 根据性能模式设置节流状态
-            if performance_mode == PERFORMANCE_MODE.ECO_MODE:
-                # 效能模式：启用节流
-                throttling_state.StateMask = PROCESS_POWER_THROTTLING_EXECUTION_SPEED
-                mode_text = "效能模式(启用节流)"
-            else:
-                # 正常模式、高性能模式、最大性能模式：禁用节流
-                throttling_state.StateMask = 0
-                if performance_mode == PERFORMANCE_MODE.NORMAL_MODE:
-                    mode_text = "正常模式(禁用节流)"
-                elif performance_mode == PERFORMANCE_MODE.HIGH_PERFORMANCE:
-                    mode_text = "高性能模式(禁用节流)"
-                else:  # MAXIMUM_PERFORMANCE
-                    mode_text = "最大性能模式(禁用节流)"
-            
-            # 调用API设置功耗模式
-            SetProcessInformation = self.kernel32.SetProcessInformation
-            result = SetProcessInformation(
-                process_handle,
-                PROCESS_POWER_THROTTLING_INFORMATION,
-                ctypes.byref(throttling_state),
-                ctypes.sizeof(throttling_state)
-            )
-            
-            if result:
-                logger.debug(f"成功将进程(PID={process_id})设置为{mode_text}")
-                return True
-            else:
-                error = self.kernel32.GetLastError()
-                logger.error(f"设置进程功耗模式失败，错误码: {error}")
-                return False
+            with self._buf_lock:
+                # 更新功耗节流状态
+                self._throttling.StateMask = throttle_mask
+                
+                # 调用API设置功耗模式
+                _SetProcessInformation(
+                    process_handle,
+                    PROCESS_POWER_THROTTLING_INFORMATION,
+                    self._throttling_ref,
+                    self._throttling_size
+                )
+            
+            logger.debug("成功将进程(PID={})设置为{}({})", process_id, mode_text,
+                         '启用节流' if throttle_mask else '禁用节流')
+            return True
                 
+        except OSError as e:
+            logger.error(f"设置进程功耗模式失败，错误码: {e.winerror}")
+            return False
         except Exception as e:
             logger.error(f"设置进程功耗模式时发生异常: {str(e)}")
             return False
-        finally:
-            if process_handle:
-                self.kernel32.CloseHandle(process_handle)
     
     def _log_process_error(self, process_id: int, error_code: int, operation: str):
         """记录进程操作错误的详细信息"""
@@ -382,15 +636,9 @@ class ProcessIoPriorityManager:
     
     def _get_ntstatus_message(self, status_code: int) -> str:
         """获取NTSTATUS错误码的说明"""
-        ntstatus_messages = {
-            0x00000000: "STATUS_SUCCESS - 操作成功",
-            0xC0000061: "STATUS_PRIVILEGE_NOT_HELD - 权限不足，需要管理员权限",
-            0xC0000005: "STATUS_ACCESS_DENIED - 访问被拒绝",
-            0xC0000008: "STATUS_INVALID_HANDLE - 无效的句柄",
-            0xC000000D: "STATUS_INVALID_PARAMETER - 无效的参数",
-            0xC0000022: "STATUS_ACCESS_DENIED - 访问被拒绝",
-        }
-        return ntstatus_messages.get(status_code, f"未知错误码: 0x{status_code:08x}")
+        if status_code in _NTSTATUS_MSGS:
+            return _NTSTATUS_MSGS[status_code]
+        return f"未知错误码: 0x{status_code:08x}"
     
     def set_process_io_priority_by_name(self, process_name: str, priority: int = None, performance_mode: int = PERFORMANCE_MODE.ECO_MODE) -> Tuple[int, int]:
         """
@@ -408,18 +656,28 @@ class ProcessIoPriorityManager:
         total_count = 0
         
         try:
-            # 查找所有匹配的进程
-            for proc in psutil.process_iter(['pid', 'name']):
-                if proc.info['name'].lower() == process_name.lower():
-                    total_count += 1
-                    if self.set_process_io_priority(proc.info['pid'], priority, performance_mode):
-                        success_count += 1
+            # 通过进程快照查找所有匹配的进程，只打开匹配的进程
+            pids = list(_iter_pid_by_name(process_name.lower()))
+            total_count = len(pids)
+            
+            if total_count == 1:
+                success_count = int(self.set_process_io_priority(pids[0], priority, performance_mode))
+            elif total_count > 1:
+                # 多个同名进程并发优化，ctypes调用期间会释放GIL
+                with ThreadPoolExecutor(max_workers=min(MAX_OPTIMIZE_WORKERS, total_count),
+                                        thread_name_prefix="ioprio-") as executor:
+                    success_count = sum(executor.map(
+                        lambda pid: self.set_process_io_priority(pid, priority, performance_mode), pids
+                    ))
             
             if total_count == 0:
                 logger.warning(f"未找到名为 {process_name} 的进程")
             else:
-                mode_text = self.config.MODE_DESCRIPTIONS.get(performance_mode, f"未知模式({performance_mode})")
-                logger.debug(f"已为 {success_count}/{total_count} 个名为 {process_name} 的进程设置优化 ({mode_text})")
+                logger.debug(
+                    "已为 {}/{} 个名为 {} 的进程设置优化 ({})",
+                    success_count, total_count, process_name,
+                    self.config.MODE_DESCRIPTIONS.get(performance_mode) or f"未知模式({performance_mode})"
+                )
             
             return (success_count, total_count)
             
@@ -427,21 +685,59 @@ class ProcessIoPriorityManager:
             logger.error(f"通过名称设置进程优化时发生错误: {str(e)}")
             return (success_count, total_count)
     
-    def get_process_info(self, process_id: int) -> Optional[Dict[str, Any]]:
-        """获取进程信息"""
+    def apply_modes(self, mapping: Dict[str, int]) -> Dict[str, Tuple[int, int]]:
+        """
+        为多个进程名称批量设置优化，只遍历一次进程快照
+        
+        Args:
+            mapping: {小写进程名称: 性能模式}
+            
+        Returns:
+            dict: {进程名称: (成功设置的进程数, 总尝试的进程数)}
+        """
+        results = {}
+        
         try:
-            proc = psutil.Process(process_id)
-            return {
-                'pid': proc.pid,
-                'name': proc.name(),
-                'create_time': proc.create_time(),
-                'cpu_percent': proc.cpu_percent(interval=0.1),
-                'memory_percent': proc.memory_percent(),
-                'status': proc.status()
-            }
+            # 一次遍历建立 进程名称 -> 进程ID列表 的索引，只保留需要处理的名称
+            name_to_pids = {}
+            running_pids = set()
+            for pid, exe_name in _iter_processes():
+                running_pids.add(pid)
+                name = exe_name.lower()
+                if name in mapping:
+                    name_to_pids.setdefault(name, []).append(pid)
         except Exception as e:
-            logger.error(f"获取进程信息失败, PID={process_id}: {str(e)}")
-            return None
+            logger.error(f"遍历进程快照时发生错误: {str(e)}")
+            return results
+        
+        # 清除已退出进程的优化记录
+        with self._applied_lock:
+            for pid in [pid for pid in self._applied if pid not in running_pids]:
+                del self._applied[pid]
+        
+        for name, performance_mode in mapping.items():
+            pids = name_to_pids.get(name, ())
+            success_count = 0
+            apply = self._apply_by_mode.get(performance_mode)
+            if apply is not None:
+                apply = partial(apply, skip_applied=True)
+            else:
+                apply = partial(self.set_process_io_priority, priority=None, performance_mode=performance_mode)
+            for pid in pids:
+                if apply(pid):
+                    success_count += 1
+            results[name] = (success_count, len(pids))
+            
+            if not pids:
+                logger.warning(f"未找到名为 {name} 的进程")
+            else:
+                logger.debug(
+                    "已为 {}/{} 个名为 {} 的进程设置优化 ({})",
+                    success_count, len(pids), name,
+                    self.config.MODE_DESCRIPTIONS.get(performance_mode) or f"未知模式({performance_mode})"
+                )
+        
+        return results
 
 
 # =============================================================================
@@ -457,6 +753,7 @@ class ProcessIoPriorityService:
         self.io_manager = get_io_priority_manager()
         self.running = False
         self.thread = None
+        self._stop_event = threading.Event()
         self.check_interval = 30  # 检查间隔，单位秒
         self.auto_optimize_enabled = True  # 自动优化开关
     
@@ -464,6 +761,7 @@ class ProcessIoPriorityService:
         """启动I/O优先级服务"""
         if not self.running:
             self.running = True
+            self._stop_event.clear()
             self.thread = threading.Thread(target=self._service_loop, daemon=True)
             self.thread.start()
             return True
@@ -473,6 +771,7 @@ class ProcessIoPriorityService:
         """停止I/O优先级服务"""
         if self.running:
             self.running = False
+            self._stop_event.set()
             if self.thread and self.thread.is_alive():
                 self.thread.join(1.0)
             return True
@@ -487,11 +786,9 @@ class ProcessIoPriorityService:
             except Exception as e:
                 logger.error(f"I/O优先级服务出错: {str(e)}")
             
-            # 分段睡眠，便于及时响应停止信号
-            for _ in range(self.check_interval):
-                if not self.running:
-                    break
-                time.sleep(1)
+            # 等待下一次检查，收到停止信号时立即返回
+            if self._stop_event.wait(self.check_interval):
+                break
     
     def _check_and_optimize_processes(self):
         """检查并优化指定进程"""
@@ -499,27 +796,24 @@ class ProcessIoPriorityService:
         if not processes_to_optimize:
             return
         
-        total_processes = 0
-        successful_processes = 0
-        
+        # 进程名称 -> 性能模式
+        mapping = {}
         for proc_config in processes_to_optimize:
             if not isinstance(proc_config, dict) or 'name' not in proc_config:
                 continue
             
-            process_name = proc_config['name']
-            performance_mode = proc_config.get('performance_mode', PERFORMANCE_MODE.ECO_MODE)
-            
-            # 根据性能模式自动确定I/O优先级
-            success, count = self.io_manager.set_process_io_priority_by_name(
-                process_name, 
-                priority=None,  # 自动确定优先级
-                performance_mode=performance_mode
-            )
-            total_processes += count
-            successful_processes += success
+            mapping[proc_config['name'].lower()] = proc_config.get('performance_mode', PERFORMANCE_MODE.ECO_MODE)
+        
+        if not mapping:
+            return
+        
+        # 只遍历一次进程快照，根据性能模式自动确定I/O优先级
+        results = self.io_manager.apply_modes(mapping)
+        total_processes = sum(count for _, count in results.values())
+        successful_processes = sum(success for success, _ in results.values())
         
         if total_processes > 0:
-            logger.debug(f"自动优化完成: 已处理 {successful_processes}/{total_processes} 个进程")
+            logger.debug("自动优化完成: 已处理 {}/{} 个进程", successful_processes, total_processes)
 
 
 # =============================================================================
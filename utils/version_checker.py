@@ -6,9 +6,13 @@
 """
 
 import os
-import json
+import re
 import threading
+from dataclasses import dataclass
+from typing import Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from packaging import version
 from PySide6.QtCore import QObject, Signal
 from utils.logger import logger
@@ -16,12 +20,29 @@ from utils.logger import logger
 # 版本信息 - 通过 GitHub Actions 构建时会被替换
 __version__ = "1.1.3"  # 默认版本号，构建时会被替换
 
+# VERSION 文件路径（项目根目录）
+_VERSION_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'VERSION')
+
+# 版本号后缀分隔符（预发布/构建元数据）
+_VERSION_SUFFIX_RE = re.compile(r'[-+]')
+
+
+@dataclass(slots=True)
+class UpdateInfo:
+    """最新发布的更新信息"""
+    version: str
+    name: str
+    body: str
+    url: str
+    download_url: Optional[str]
+    published_at: str
+
 
 class VersionChecker(QObject):
     """版本检查器"""
 
-    # 版本检查完成信号 - (有更新, 当前版本, 最新版本, 更新信息, 错误信息)
-    check_finished = Signal(bool, str, str, str, str)
+    # 版本检查完成信号 - (有更新, 当前版本, 最新版本, UpdateInfo, 错误信息)
+    check_finished = Signal(bool, str, str, object, str)
 
     def __init__(self):
         super().__init__()
@@ -29,18 +50,49 @@ class VersionChecker(QObject):
         self.github_releases_url = "https://github.com/tools5/ACE-KILLER/releases"
         self.timeout = 10
 
+        # 当前版本号在进程运行期间不变，首次读取后缓存
+        self._cached_version = None
+
+        # 上次获取的发布信息及其ETag，发布未变化时GitHub返回304
+        self._last_etag = None
+        self._cached_update_info = None
+
+        # 复用连接的会话，多次检查更新时保持与GitHub的长连接
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=4,
+            # 只对网关类错误重试；连接/读取失败不重试，避免断网时等待多个超时周期。
+            # 重试用尽后仍返回响应，由 raise_for_status 给出HTTP错误提示
+            max_retries=Retry(total=2, connect=0, read=0, backoff_factor=0.3,
+                              status_forcelist=[502, 503, 504], raise_on_status=False)
+        ))
+        self._session.headers.update({
+            'User-Agent': f'ACE-KILLER/{self.get_current_version()}',
+            'Accept': 'application/vnd.github.v3+json'
+        })
+
     def get_current_version(self):
         """
         获取当前版本号
         """
+        if self._cached_version is not None:
+            return self._cached_version
+
+        self._cached_version = self._read_current_version()
+        return self._cached_version
+
+    def _read_current_version(self):
+        """
+        从环境变量、VERSION文件或默认值读取当前版本号
+        """
         env_version = os.environ.get('tools5')
         if env_version:
             return env_version.strip()
 
         try:
-            version_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'VERSION')
-            if os.path.exists(version_file):
-                with open(version_file, 'r', encoding='utf-8') as f:
+            if os.path.exists(_VERSION_FILE_PATH):
+                with open(_VERSION_FILE_PATH, 'r', encoding='utf-8') as f:
                     file_version = f.read().strip()
                     if file_version:
                         return file_version
@@ -55,77 +107,48 @@ class VersionChecker(QObject):
         thread.start()
 
     def _check_for_updates_thread(self):
-        try:
-            current_ver = self.get_current_version()
-
-            headers = {
-                'User-Agent': f'ACE-KILLER/{current_ver}',
-                'Accept': 'application/vnd.github.v3+json'
-            }
+        current_ver = self.get_current_version()
 
+        try:
             logger.debug(f"正在检查更新，当前版本: {current_ver}")
 
-            response = requests.get(self.github_api_url, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
-
-            release_data = response.json()
+            # 带上ETag发起条件请求，发布未变化时复用上次的发布信息
+            headers = None
+            if self._last_etag and self._cached_update_info is not None:
+                headers = {'If-None-Match': self._last_etag}
 
-            latest_version = release_data.get('tag_name', '').lstrip('v')
-            release_name = release_data.get('name', '')
-            release_body = release_data.get('body', '')
-            release_url = release_data.get('html_url', self.github_releases_url)
-
-            if not latest_version:
-                raise ValueError("无法获取最新版本号")
+            response = self._session.get(self.github_api_url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and self._cached_update_info is not None:
+                logger.debug("最新发布信息未变化，使用缓存")
+                update_info = self._cached_update_info
+            else:
+                response.raise_for_status()
+                update_info = self._parse_release(response.json())
+                self._last_etag = response.headers.get('ETag')
+                self._cached_update_info = update_info
 
+            latest_version = update_info.version
             has_update = self._compare_versions(current_ver, latest_version)
 
-            assets = release_data.get('assets', [])
-            download_url = None
-            for asset in assets:
-                asset_name = asset.get('name', '').lower()
-                if asset_name.endswith('.zip') and 'x64' in asset_name:
-                    download_url = asset.get('browser_download_url')
-                    break
-
-            if not download_url:
-                for asset in assets:
-                    asset_name = asset.get('name', '').lower()
-                    if asset_name.endswith('.zip'):
-                        download_url = asset.get('browser_download_url')
-                        break
-
-            update_info = {
-                'version': latest_version,
-                'name': release_name,
-                'body': release_body,
-                'url': release_url,
-                'download_url': download_url,
-                'published_at': release_data.get('published_at', ''),
-                'assets': assets
-            }
-
-            update_info_str = json.dumps(update_info, ensure_ascii=False, indent=2)
-
             logger.debug(f"版本检查完成 - 当前: {current_ver}, 最新: {latest_version}, 有更新: {has_update}")
 
             self.check_finished.emit(
                 has_update,
                 current_ver,
                 latest_version,
-                update_info_str,
+                update_info,
                 ""
             )
 
         except requests.exceptions.Timeout:
             error_msg = "网络请求超时，请检查网络连接后稍后重试"
             logger.warning(f"检查更新失败: {error_msg}")
-            self.check_finished.emit(False, self.get_current_version(), "", "", error_msg)
+            self.check_finished.emit(False, current_ver, "", None, error_msg)
 
         except requests.exceptions.ConnectionError:
             error_msg = "网络连接失败，请检查网络连接后稍后重试"
             logger.warning(f"检查更新失败: {error_msg}")
-            self.check_finished.emit(False, self.get_current_version(), "", "", error_msg)
+            self.check_finished.emit(False, current_ver, "", None, error_msg)
 
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 403:
@@ -133,14 +156,58 @@ class VersionChecker(QObject):
             else:
                 error_msg = f"GitHub API 请求失败: {e.response.status_code}"
             logger.warning(f"检查更新失败: {error_msg}")
-            self.check_finished.emit(False, self.get_current_version(), "", "", error_msg)
+            self.check_finished.emit(False, current_ver, "", None, error_msg)
 
         except Exception as e:
             error_msg = f"检查更新时发生错误: {str(e)}"
             logger.error(f"检查更新失败: {error_msg}")
-            self.check_finished.emit(False, self.get_current_version(), "", "", error_msg)
+            self.check_finished.emit(False, current_ver, "", None, error_msg)
+
+    def _parse_release(self, release_data):
+        """
+        从GitHub发布数据中提取更新信息
+        """
+        latest_version = release_data.get('tag_name', '').lstrip('v')
+        release_name = release_data.get('name') or ''
+        release_body = (release_data.get('body') or '').strip()
+        # 更新内容只用于提示框展示，获取时即截断
+        if len(release_body) > 300:
+            release_body = release_body[:300] + "..."
+        release_url = release_data.get('html_url', self.github_releases_url)
+
+        if not latest_version:
+            raise ValueError("无法获取最新版本号")
+
+        assets = release_data.get('assets', [])
+        # 一次遍历：优先x64压缩包，否则使用第一个压缩包
+        download_url = None
+        fallback_url = None
+        for asset in assets:
+            asset_name = asset.get('name') or ''
+            # 只对扩展名部分忽略大小写，避免为每个资源生成小写副本
+            if len(asset_name) < 4 or asset_name[-4:].lower() != '.zip':
+                continue
+            asset_url = asset.get('browser_download_url')
+            if 'x64' in asset_name or 'X64' in asset_name:
+                download_url = asset_url
+                break
+            if fallback_url is None:
+                fallback_url = asset_url
+        download_url = download_url or fallback_url
+
+        return UpdateInfo(
+            version=latest_version,
+            name=release_name,
+            body=release_body,
+            url=release_url,
+            download_url=download_url,
+            published_at=release_data.get('published_at') or ''
+        )
 
     def _compare_versions(self, current_ver, latest_ver):
+        # 版本号字符串相同（最常见的无更新情况）时无需解析
+        if current_ver == latest_ver:
+            return False
         try:
             current_clean = self._clean_version(current_ver)
             latest_clean = self._clean_version(latest_ver)
@@ -152,19 +219,23 @@ class VersionChecker(QObject):
     def _clean_version(self, ver_str):
         if not ver_str:
             return "0.0.0"
-        import re
         cleaned = ver_str.lstrip('v')
-        cleaned = re.split(r'[-+]', cleaned)[0]
+        cleaned = _VERSION_SUFFIX_RE.split(cleaned, maxsplit=1)[0]
         parts = cleaned.split('.')
         while len(parts) < 3:
             parts.append('0')
         return '.'.join(parts[:3])
 
 
+# 单例实例获取函数
+_version_checker_instance = None
+
+
 def get_version_checker():
-    if not hasattr(get_version_checker, '_instance'):
-        get_version_checker._instance = VersionChecker()
-    return get_version_checker._instance
+    global _version_checker_instance
+    if _version_checker_instance is None:
+        _version_checker_instance = VersionChecker()
+    return _version_checker_instance
 
 
 def get_current_version():
@@ -178,7 +249,7 @@ def format_version_info(current_version, latest_version=None, has_update=False):
         return f"当前版本: v{current_version}"
 
 
-def create_update_message(has_update, current_ver, latest_ver, update_info_str, error_msg):
+def create_update_message(has_update, current_ver, latest_ver, update_info, error_msg):
     if error_msg:
         return (
             "检查更新失败",
@@ -194,49 +265,32 @@ def create_update_message(has_update, current_ver, latest_ver, update_info_str,
         )
 
     if has_update:
-        try:
-            update_info = json.loads(update_info_str)
-            release_name = update_info.get('name', f'v{latest_ver}')
-            release_body = update_info.get('body', '').strip()
-            release_url = update_info.get('url', 'https://github.com/tools5/ACE-KILLER/releases')
-            direct_download_url = update_info.get('download_url')
-
-            if len(release_body) > 300:
-                release_body = release_body[:300] + "..."
-
-            message = (
-                f"发现新版本！\n\n"
-                f"当前版本: v{current_ver}\n"
-                f"最新版本: v{latest_ver}\n\n"
-                f"版本名称: {release_name}\n\n"
-            )
-
-            if release_body:
-                message += f"更新内容:\n{release_body}\n\n"
+        release_name = update_info.name or f'v{latest_ver}'
+        release_body = update_info.body
+        release_url = update_info.url or 'https://github.com/tools5/ACE-KILLER/releases'
+        direct_download_url = update_info.download_url
+
+        message = (
+            f"发现新版本！\n\n"
+            f"当前版本: v{current_ver}\n"
+            f"最新版本: v{latest_ver}\n\n"
+            f"版本名称: {release_name}\n\n"
+        )
 
-            message += "是否立即下载新版本？" if direct_download_url else "是否前往下载页面？"
+        if release_body:
+            message += f"更新内容:\n{release_body}\n\n"
 
-            return (
-                "发现新版本",
-                message,
-                "update",
-                {
-                    "download_url": direct_download_url if direct_download_url else release_url,
-                    "is_direct_download": bool(direct_download_url)
-                }
-            )
+        message += "是否立即下载新版本？" if direct_download_url else "是否前往下载页面？"
 
-        except Exception as e:
-            logger.error(f"解析更新信息失败: {str(e)}")
-            return (
-                "发现新版本",
-                f"发现新版本！\n\n当前版本: v{current_ver}\n最新版本: v{latest_ver}\n\n是否前往下载页面？",
-                "update",
-                {
-                    "download_url": "https://github.com/tools5/ACE-KILLER/releases",
-                    "is_direct_download": False
-                }
-            )
+        return (
+            "发现新版本",
+            message,
+            "update",
+            {
+                "download_url": direct_download_url if direct_download_url else release_url,
+                "is_direct_download": bool(direct_download_url)
+            }
+        )
 
     else:
         return (